@@ -58,29 +58,43 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
-    win_no_prefer_redirects=False,
-    win_private_assemblies=False,
+    # Modules the app never imports; dropping them shrinks the bundle.
+    # scipy/torch/sympy/pandas submodules are kept: sklearn, torch and
+    # Streamlit import them internally.
+    excludes=[
+        'matplotlib',
+        'torchvision',
+        'IPython',
+        'jupyter',
+        'notebook',
+        'pytest',
+        'nltk.test',
+        'PIL.ImageQt',
+        'tkinter',
+    ],
     cipher=block_cipher,
     noarchive=False,
+    # Bytecode optimization level (PyInstaller >= 6.0), applied to every
+    # collected module: 1 strips assert statements, so safety checks must use
+    # explicit "if ...: raise". Not 2: that also strips docstrings, which some
+    # bundled scientific libraries build or edit at import time.
+    optimize=1,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
+# One-folder build: binaries and data live next to the executable, so
+# launches don't first unpack the whole bundle into a temp directory
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='ChatCompanion',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
+    strip=sys.platform != 'win32',  # Stripping symbols breaks Windows binaries
     upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,  # Set to True for debugging
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -90,3 +104,14 @@ exe = EXE(
     icon=None,  # Add icon path here if you have one
 )
 
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=sys.platform != 'win32',
+    upx=True,
+    # UPX is known to corrupt these DLLs
+    upx_exclude=['vcruntime140.dll', 'python3.dll', f'python3{sys.version_info.minor}.dll'],
+    name='ChatCompanion',
+)
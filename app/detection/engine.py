@@ -1,6 +1,7 @@
 """Main detection engine orchestrator."""
 
 import logging
+from functools import cached_property
 from typing import Dict, List, Optional, Tuple
 
 from app.detection.aggregator import ScoreAggregator
@@ -36,6 +37,16 @@ class DetectionResult:
         self.matches = matches
         self.ml_available = ml_available
 
+    @cached_property
+    def explanation_lower(self) -> str:
+        """Lowercased explanation, for case-insensitive substring checks."""
+        return self.explanation.lower()
+
+    @cached_property
+    def total_match_count(self) -> int:
+        """Total number of pattern matches across all categories."""
+        return sum(map(len, self.matches.values()))
+
 
 class DetectionEngine:
     """Main orchestrator for risk detection."""
@@ -99,13 +110,78 @@ class DetectionEngine:
         Returns:
             DetectionResult with risk level, scores, and explanations
         """
+        rules_state = self._analyze_rules(text)
+
+        # Run ML classifier if available (hybrid mode)
+        ml_scores = {}
+        if self.ml_available and self.classifier:
+            try:
+                # Classify each sentence and take maximum
+                # (segmented only here: rules-only mode never needs sentences)
+                sentences = segment_sentences(rules_state[0])
+                sentence_scores = self.classifier.classify_batch(sentences)
+                ml_scores = self._aggregate_sentence_scores(sentence_scores)
+            except Exception as e:
+                logger.error(f"Error in ML classification: {e}")
+                logger.warning("Continuing with rules-only scores")
+
+        return self._build_result(text, rules_state, ml_scores)
+
+    def analyze_batch(self, texts: List[str]) -> List[DetectionResult]:
+        """
+        Perform risk analysis on several chat texts at once.
+
+        Equivalent to calling analyze() on each text, but in hybrid mode the
+        sentences of all texts are embedded in a single classifier batch.
+
+        Args:
+            texts: Chat texts to analyze
+
+        Returns:
+            List of DetectionResult objects, in the same order as texts
+        """
+        rules_states = [self._analyze_rules(text) for text in texts]
+
+        # Run ML classifier once over the sentences of every text
+        ml_scores_per_text: List[Dict[str, float]] = [{} for _ in texts]
+        if self.ml_available and self.classifier:
+            try:
+                sentences_per_text = [segment_sentences(state[0]) for state in rules_states]
+                all_sentences = [s for sentences in sentences_per_text for s in sentences]
+                all_scores = self.classifier.classify_batch(all_sentences)
+
+                # Split the flat score list back into per-text slices
+                offset = 0
+                for i, sentences in enumerate(sentences_per_text):
+                    sentence_scores = all_scores[offset:offset + len(sentences)]
+                    offset += len(sentences)
+                    ml_scores_per_text[i] = self._aggregate_sentence_scores(sentence_scores)
+            except Exception as e:
+                logger.error(f"Error in ML classification: {e}")
+                logger.warning("Continuing with rules-only scores")
+
+        return [
+            self._build_result(text, rules_state, ml_scores)
+            for text, rules_state, ml_scores in zip(texts, rules_states, ml_scores_per_text)
+        ]
+
+    def _analyze_rules(self, text: str) -> Tuple[str, Dict[str, float], Dict[str, list], bool, bool]:
+        """
+        Run normalization, the rules engine and context checks on chat text.
+
+        Args:
+            text: Chat text to analyze
+
+        Returns:
+            Tuple of (normalized text, rule scores, matches,
+            is friendly teasing, is professional context)
+        """
         # Normalize slang and abbreviations first
         slang_normalizer = SlangNormalizer()
         normalized_message = slang_normalizer.normalize_message(text)
         
         # Then apply standard text normalization
         normalized_text = normalize_text(normalized_message.normalized_text)
-        sentences = segment_sentences(normalized_text)
 
         # Run rules engine on normalized text (with slang normalized)
         rules_result = self.rule_engine.analyze(normalized_text)
@@ -163,27 +239,50 @@ class DetectionEngine:
         else:
             logger.debug("Rules detection: No patterns matched")
 
-        # Run ML classifier if available (hybrid mode)
+        return normalized_text, rules_scores, matches, is_friendly_teasing, is_professional_context
+
+    def _aggregate_sentence_scores(self, sentence_scores: List[Dict[str, float]]) -> Dict[str, float]:
+        """
+        Aggregate sentence-level ML scores by taking the maximum per category.
+
+        Args:
+            sentence_scores: Category score dictionaries, one per sentence
+
+        Returns:
+            Dictionary mapping category to its highest non-zero sentence score
+        """
         ml_scores = {}
-        if self.ml_available and self.classifier:
-            try:
-                # Classify each sentence and take maximum
-                sentence_scores = self.classifier.classify_batch(sentences)
-                if sentence_scores:
-                    # Aggregate sentence-level scores
-                    for category in RiskCategory:
-                        category_str = category.value
-                        max_score = max(
-                            (s.get(category_str, 0.0) for s in sentence_scores), default=0.0
-                        )
-                        if max_score > 0:
-                            ml_scores[category_str] = max_score
-                    
-                    if ml_scores:
-                        logger.debug(f"ML scores generated: {len(ml_scores)} categories")
-            except Exception as e:
-                logger.error(f"Error in ML classification: {e}")
-                logger.warning("Continuing with rules-only scores")
+        if sentence_scores:
+            for category in RiskCategory:
+                category_str = category.value
+                max_score = max(
+                    (s.get(category_str, 0.0) for s in sentence_scores), default=0.0
+                )
+                if max_score > 0:
+                    ml_scores[category_str] = max_score
+            
+            if ml_scores:
+                logger.debug(f"ML scores generated: {len(ml_scores)} categories")
+        return ml_scores
+
+    def _build_result(
+        self,
+        text: str,
+        rules_state: Tuple[str, Dict[str, float], Dict[str, list], bool, bool],
+        ml_scores: Dict[str, float],
+    ) -> DetectionResult:
+        """
+        Combine rule and ML scores into the final detection result.
+
+        Args:
+            text: Original chat text (used for explanations)
+            rules_state: Output of _analyze_rules for this text
+            ml_scores: Aggregated ML scores (empty in rules-only mode)
+
+        Returns:
+            DetectionResult with risk level, scores, and explanations
+        """
+        _, rules_scores, matches, is_friendly_teasing, is_professional_context = rules_state
 
         # Aggregate scores (hybrid mode if ML available, rules-only otherwise)
         if ml_scores and self.ml_available:
@@ -19,6 +19,44 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     logger.warning("scikit-learn not available. ML classification will be disabled.")
 
+# Number of texts embedded per forward pass in classify_batch
+BATCH_SIZE = 64
+
+# Example phrases that represent each risk category (can be expanded).
+# scripts/download_models.py also uses them to check int8 model parity.
+REFERENCE_PHRASES = {
+    RiskCategory.BULLYING: [
+        "You are ugly and stupid",
+        "Nobody likes you",
+        "Everyone hates you",
+    ],
+    RiskCategory.MANIPULATION: [
+        "If you really cared about me, you would do this",
+        "You owe me after all I did for you",
+        "I'm the only one who understands you",
+    ],
+    RiskCategory.PRESSURE: [
+        "You have to do this right now",
+        "Don't be a baby, everyone else does it",
+        "You must send this immediately",
+    ],
+    RiskCategory.SECRECY: [
+        "Don't tell anyone about this",
+        "Keep this our secret",
+        "Delete these messages",
+    ],
+    RiskCategory.GUILT_SHIFTING: [
+        "This is all your fault",
+        "You made me do this",
+        "This is because of you",
+    ],
+    RiskCategory.GROOMING: [
+        "You're so mature for your age",
+        "Adults won't understand us",
+        "Meet me alone without telling anyone",
+    ],
+}
+
 
 class RiskClassifier:
     """Classifier for risk detection using embeddings."""
@@ -35,39 +73,9 @@ class RiskClassifier:
             embedding_model = EmbeddingModel()
         self.embedding_model = embedding_model
 
-        # Reference embeddings for risk categories (can be expanded)
-        # These are example phrases that represent each risk category
+        # Per-instance copy, so expanding one classifier's phrases leaves others alone
         self.reference_phrases = {
-            RiskCategory.BULLYING: [
-                "You are ugly and stupid",
-                "Nobody likes you",
-                "Everyone hates you",
-            ],
-            RiskCategory.MANIPULATION: [
-                "If you really cared about me, you would do this",
-                "You owe me after all I did for you",
-                "I'm the only one who understands you",
-            ],
-            RiskCategory.PRESSURE: [
-                "You have to do this right now",
-                "Don't be a baby, everyone else does it",
-                "You must send this immediately",
-            ],
-            RiskCategory.SECRECY: [
-                "Don't tell anyone about this",
-                "Keep this our secret",
-                "Delete these messages",
-            ],
-            RiskCategory.GUILT_SHIFTING: [
-                "This is all your fault",
-                "You made me do this",
-                "This is because of you",
-            ],
-            RiskCategory.GROOMING: [
-                "You're so mature for your age",
-                "Adults won't understand us",
-                "Meet me alone without telling anyone",
-            ],
+            category: list(phrases) for category, phrases in REFERENCE_PHRASES.items()
         }
 
         # Pre-compute reference embeddings if model is available
@@ -122,11 +130,41 @@ class RiskClassifier:
         """
         Classify multiple texts.
 
+        All texts are embedded in one encode call and compared against the
+        reference embeddings with one similarity matrix per category.
+
         Args:
             texts: List of texts to classify
 
         Returns:
             List of category score dictionaries
         """
-        return [self.classify(text) for text in texts]
+        if not texts:
+            return []
+
+        if not self.embedding_model.available or not SKLEARN_AVAILABLE:
+            # Fallback: return empty scores (rules-only mode)
+            return [{} for _ in texts]
+
+        # Generate embeddings for all input texts at once
+        text_embeddings = self.embedding_model.encode(texts, batch_size=BATCH_SIZE)
+        if text_embeddings is None:
+            return [{} for _ in texts]
+
+        text_embeddings = np.array(text_embeddings)
+        category_scores = [{} for _ in texts]
+
+        # Compare against reference embeddings for each category
+        for category, ref_embeddings in self.reference_embeddings.items():
+            if not ref_embeddings:
+                for scores in category_scores:
+                    scores[category] = 0.0
+                continue
+
+            # Use maximum similarity per text as category score
+            max_similarities = cosine_similarity(text_embeddings, ref_embeddings).max(axis=1)
+            for scores, max_similarity in zip(category_scores, max_similarities):
+                scores[category] = float(max_similarity)
+
+        return category_scores
 
@@ -17,6 +17,77 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     logger.warning("sentence-transformers not available. ML features will be disabled.")
 
+# Try to import onnxruntime and a tokenizer for the quantized ONNX model (optional)
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+class OnnxSentenceEncoder:
+    """Sentence encoder running a quantized ONNX export with onnxruntime.
+
+    Mirrors the all-MiniLM-L6-v2 pipeline (tokenize, transformer, mean
+    pooling, L2 normalization) and exposes the subset of the
+    SentenceTransformer.encode interface that EmbeddingModel uses.
+    """
+
+    def __init__(self, model_dir: Path, onnx_path: Path, max_seq_length: int = 256):
+        """
+        Initialize ONNX encoder.
+
+        Args:
+            model_dir: Model directory containing the tokenizer files
+            onnx_path: Path to the quantized .onnx file
+            max_seq_length: Maximum number of tokens per text
+        """
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.max_seq_length = max_seq_length
+
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs):
+        """
+        Generate normalized sentence embeddings.
+
+        Args:
+            texts: List of text strings to encode
+            batch_size: Number of texts per inference call
+            **kwargs: Accepted for SentenceTransformer compatibility and ignored
+
+        Returns:
+            NumPy array of shape (len(texts), embedding_dim)
+        """
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feeds = {
+                name: array.astype(np.int64)
+                for name, array in encoded.items()
+                if name in self.input_names
+            }
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over non-padding tokens, then L2 normalization
+            mask = encoded["attention_mask"][..., None].astype(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            batches.append(pooled / np.clip(norms, 1e-12, None))
+
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(batches)
+
 
 class EmbeddingModel:
     """Wrapper for sentence embedding model."""
@@ -34,11 +105,22 @@ class EmbeddingModel:
         self.loader = ModelLoader(models_dir)
         self.available = False
 
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
+        if SENTENCE_TRANSFORMERS_AVAILABLE or ONNX_AVAILABLE:
             self._load_model()
 
     def _load_model(self) -> None:
-        """Load the sentence transformer model from local storage only."""
+        """Load the sentence transformer model from local storage only.
+
+        Prefers the int8-quantized ONNX export and falls back to the PyTorch
+        model. scripts/download_models.py only keeps the export if its
+        reference-phrase similarities match the fp32 model.
+        """
+        if ONNX_AVAILABLE and self._load_onnx_model():
+            return
+
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return
+
         try:
             # Try to load from local directory first
             model_path = self.loader.get_model_path(self.model_name)
@@ -60,12 +142,35 @@ class EmbeddingModel:
             logger.warning("Falling back to RULES-ONLY mode.")
             self.available = False
 
-    def encode(self, texts: List[str]) -> Optional[List[List[float]]]:
+    def _load_onnx_model(self) -> bool:
+        """
+        Load the quantized ONNX export if it exists locally.
+
+        Returns:
+            True if the ONNX model was loaded, False otherwise
+        """
+        onnx_path = self.loader.get_quantized_model_path(self.model_name)
+        if onnx_path is None:
+            return False
+
+        try:
+            logger.info(f"Loading quantized ONNX model from: {onnx_path}")
+            self.model = OnnxSentenceEncoder(self.loader.models_dir / self.model_name, onnx_path)
+            self.available = True
+            logger.info(f"Embedding model {self.model_name} (ONNX int8) loaded successfully")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model, trying PyTorch model: {e}")
+            self.model = None
+            return False
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> Optional[List[List[float]]]:
         """
         Generate embeddings for a list of texts.
 
         Args:
             texts: List of text strings to encode
+            batch_size: Number of texts the model encodes per forward pass
 
         Returns:
             List of embedding vectors, or None if model not available
@@ -74,7 +179,9 @@ class EmbeddingModel:
             return None
 
         try:
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
+            embeddings = self.model.encode(
+                texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+            )
             return embeddings.tolist()
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
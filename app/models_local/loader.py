@@ -6,6 +6,9 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Location of the int8-quantized ONNX export inside a model directory
+QUANTIZED_ONNX_FILE = Path("onnx") / "model_quantized.onnx"
+
 
 class ModelLoader:
     """Utility for loading and managing local models."""
@@ -62,3 +65,17 @@ class ModelLoader:
                     return path
         return None
 
+    def get_quantized_model_path(self, model_name: str) -> Optional[Path]:
+        """
+        Get path to the quantized ONNX export of a model if it exists.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            Path to the quantized .onnx file or None if not found
+        """
+        path = self.models_dir / model_name / QUANTIZED_ONNX_FILE
+        if path.exists():
+            return path
+        return None
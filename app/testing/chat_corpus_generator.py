@@ -5,8 +5,34 @@ All chats are fully synthetic and designed for testing the detection pipeline.
 """
 
 import random
+import zlib
 from typing import Dict, List
 
+# Risk levels in corpus order
+RISK_LEVELS = ("green", "yellow", "red")
+
+
+def generate_level(level: str, count: int, seed: int = 1337) -> List[Dict]:
+    """
+    Generate the chats for one risk level with a level-specific seed.
+
+    Each level gets its own random stream derived from the corpus seed, so
+    levels can be generated independently (e.g. in separate processes) and
+    still produce the same corpus for a given seed.
+
+    Args:
+        level: "green", "yellow", or "red"
+        count: Number of chats to generate
+        seed: Corpus random seed
+
+    Returns:
+        List of chat dictionaries
+    """
+    # crc32 is stable across processes, unlike hash() on strings
+    level_seed = zlib.crc32(f"{seed}:{level}".encode("utf-8"))
+    generator = ChatCorpusGenerator(seed=level_seed)
+    return [generator.generate_chat(level, f"{level}_{i+1:03d}") for i in range(count)]
+
 
 class ChatCorpusGenerator:
     """Generates deterministic synthetic chat conversations for testing."""
@@ -18,6 +44,7 @@ class ChatCorpusGenerator:
         Args:
             seed: Random seed for deterministic generation
         """
+        self.seed = seed
         self.rng = random.Random(seed)
         self._init_phrase_banks()
 
@@ -268,6 +295,9 @@ class ChatCorpusGenerator:
         """
         Generate a corpus of chats.
 
+        Each risk level is generated with its own seed derived from this
+        generator's seed (see generate_level).
+
         Args:
             count_per_level: Number of chats to generate per risk level
 
@@ -276,11 +306,7 @@ class ChatCorpusGenerator:
         """
         corpus = []
         
-        for level in ["green", "yellow", "red"]:
-            for i in range(count_per_level):
-                chat_id = f"{level}_{i+1:03d}"
-                chat = self.generate_chat(level, chat_id)
-                corpus.append(chat)
+        for level in RISK_LEVELS:
+            corpus.extend(generate_level(level, count_per_level, self.seed))
         
         return corpus
-
@@ -223,11 +223,7 @@ def render_next_steps(risk_level: RiskLevel) -> None:
     """
     st.divider()
     
-    # Wrap Next Steps in a visual panel (using Streamlit container for structure)
-    with st.container():
-        st.markdown("### Recommended Next Steps")
-        
-        # Initialize session state for next steps buttons
+    # Initialize session state for next steps buttons
     if "show_no_examples" not in st.session_state:
         st.session_state.show_no_examples = False
     if "show_professional_help" not in st.session_state:
@@ -242,39 +238,44 @@ def render_next_steps(risk_level: RiskLevel) -> None:
         st.session_state.show_professional_help = True
         st.session_state.show_no_examples = False
     
-    # For GREEN: show only "Show how to say NO" button, with optional resources link below
-    # For YELLOW and RED: show both buttons prominently
-    if risk_level == RiskLevel.GREEN:
-        # Single button for GREEN
-        st.button("Show how to say NO", use_container_width=True, key="btn_show_no", on_click=on_show_no_click)
-        
-        # Small optional resources expander for GREEN (non-intrusive, collapsed by default)
-        with st.expander("Optional resources", expanded=False):
-            st.markdown(
-                """
-                **If you need support or have questions:**
-                
-                - **klicksafe.de** - Information and support for online safety
-                - Talk to someone you trust: a parent, teacher, counselor, or another trusted person
-                
-                **Remember:** It's always okay to ask for help, even if you're not sure if something is wrong.
-                
-                **klicksafe.de**: https://www.klicksafe.de
-                
-                (You can copy this link and open it in your browser)
-                """
-            )
-    else:
-        # YELLOW and RED: show both buttons prominently
-        col1, col2 = st.columns(2)
+    # Wrap Next Steps in a visual panel. The key gives the container a stable
+    # "st-key-next_steps_panel" class, which the theme CSS targets directly.
+    with st.container(key="next_steps_panel"):
+        st.markdown("### Recommended Next Steps")
         
-        with col1:
-            # Use on_click callback to set state before rerun
+        # For GREEN: show only "Show how to say NO" button, with optional resources link below
+        # For YELLOW and RED: show both buttons prominently
+        if risk_level == RiskLevel.GREEN:
+            # Single button for GREEN
             st.button("Show how to say NO", use_container_width=True, key="btn_show_no", on_click=on_show_no_click)
-        
-        with col2:
-            # Use on_click callback to set state before rerun
-            st.button("Get Professional Help", use_container_width=True, key="btn_get_help", on_click=on_get_help_click)
+            
+            # Small optional resources expander for GREEN (non-intrusive, collapsed by default)
+            with st.expander("Optional resources", expanded=False):
+                st.markdown(
+                    """
+                    **If you need support or have questions:**
+                    
+                    - **klicksafe.de** - Information and support for online safety
+                    - Talk to someone you trust: a parent, teacher, counselor, or another trusted person
+                    
+                    **Remember:** It's always okay to ask for help, even if you're not sure if something is wrong.
+                    
+                    **klicksafe.de**: https://www.klicksafe.de
+                    
+                    (You can copy this link and open it in your browser)
+                    """
+                )
+        else:
+            # YELLOW and RED: show both buttons prominently
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Use on_click callback to set state before rerun
+                st.button("Show how to say NO", use_container_width=True, key="btn_show_no", on_click=on_show_no_click)
+            
+            with col2:
+                # Use on_click callback to set state before rerun
+                st.button("Get Professional Help", use_container_width=True, key="btn_get_help", on_click=on_get_help_click)
     
     # "Show how to say NO" expander - only render if state is True
     if st.session_state.show_no_examples:
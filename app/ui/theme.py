@@ -3,12 +3,10 @@
 Provides consistent styling, colors, spacing, and kid-friendly design elements.
 """
 
-import streamlit as st
-
-
-def inject_theme_css():
-    """Inject custom CSS theme for kid-friendly, product-like UI."""
-    css = """
+# Theme stylesheet, built once at import time rather than on every rerun.
+# It is still emitted on every run: Streamlit removes elements that a rerun
+# does not re-render, so skipping the injection would drop the styles.
+THEME_CSS = """
     <style>
         /* Brand color system - CSS variables for consistency */
         :root {
@@ -350,52 +348,17 @@ def inject_theme_css():
         
         /* Hide anchor icons next to headings (judge-friendly polish)
          * Intent: Hide only the anchor/link icons (🔗) that appear next to headings.
-         * Content links (e.g., klicksafe.de) remain visible and clickable.
-         * External links (http://, https://) are explicitly preserved.
+         * Only links inside headings are matched, and only in-page links
+         * (href="#...") or anchor-classed ones, so content links
+         * (e.g., klicksafe.de) remain visible and clickable.
          */
-        a[aria-label="Link to this section"] { 
-            display: none !important; 
-        }
-        a.header-anchor { 
-            display: none !important; 
-        }
-        a.anchor-link { 
-            display: none !important; 
-        }
-        a[class*="anchor"] { 
-            display: none !important; 
-        }
-        a[class*="header"] { 
-            display: none !important; 
-        }
-        .stMarkdown a[href^="#"][aria-label] { 
-            display: none !important; 
-        }
-        .stMarkdown h1 > a,
-        .stMarkdown h2 > a,
-        .stMarkdown h3 > a,
-        .stMarkdown h4 > a,
-        .stMarkdown h5 > a,
-        .stMarkdown h6 > a {
+        :is(h1, h2, h3, h4, h5, h6) :is(a[href^="#"], a[class*="anchor" i]) {
             display: none !important;
         }
-        h1 a, h2 a, h3 a, h4 a, h5 a, h6 a { 
-            display: none !important; 
-        }
-        /* Preserve external links and content links - only hide anchor links */
-        .stMarkdown a[href^="http://"],
-        .stMarkdown a[href^="https://"] {
-            display: inline !important;
-        }
-        .stMarkdown a:not([href^="#"]) {
-            display: inline !important;
-        }
         
         /* Next Steps panel styling - clean panel feel */
-        /* Style containers that follow dividers and contain buttons/expanders (Next Steps section) */
-        /* This targets the container wrapping "Recommended Next Steps" */
-        hr + .element-container:has(button),
-        hr ~ .element-container:has(button) {
+        /* Targets the keyed container rendered by render_next_steps */
+        .st-key-next_steps_panel {
             background-color: #f8f9fa;
             border-radius: 12px;
             padding: 20px;
@@ -412,8 +375,12 @@ def inject_theme_css():
             padding: 0 !important;
         }
     </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
+"""
 
 
+def inject_theme_css():
+    """Inject custom CSS theme for kid-friendly, product-like UI."""
+    # Imported lazily so tools that only need THEME_CSS don't load Streamlit
+    import streamlit as st
 
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
@@ -33,3 +33,7 @@ RISK_THRESHOLDS = {
     RiskLevel.RED: 0.75,  # 0.75 - 1.0 (lowered from 0.8 to catch high-risk cases)
 }
 
+
+# Environment flag values (compared after strip().lower())
+ENV_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+ENV_FALSE_VALUES = frozenset({"0", "false", "no", "off"})
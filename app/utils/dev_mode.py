@@ -5,6 +5,15 @@ mode is enabled. Developer mode enables additional debug information in the UI.
 """
 
 import os
+from functools import lru_cache
+
+from app.utils.constants import ENV_TRUE_VALUES
+
+
+@lru_cache(maxsize=8)
+def _parse_dev_mode(env_value: str) -> bool:
+    """Normalize a raw CHATCOMPANION_DEV_MODE value, cached per distinct value."""
+    return env_value.strip().lower() in ENV_TRUE_VALUES
 
 
 def is_dev_mode() -> bool:
@@ -17,6 +26,6 @@ def is_dev_mode() -> bool:
     Returns:
         True if developer mode is enabled, False otherwise (default)
     """
-    env_value = os.getenv("CHATCOMPANION_DEV_MODE", "").strip().lower()
-    return env_value in {"1", "true", "yes", "on"}
+    # Keyed on the raw value, so changes to the environment are always seen
+    return _parse_dev_mode(os.getenv("CHATCOMPANION_DEV_MODE", ""))
 
@@ -6,6 +6,8 @@ Reads CHATCOMPANION_FUN_UI environment variable to determine if fun UI features
 
 import os
 
+from app.utils.constants import ENV_FALSE_VALUES, ENV_TRUE_VALUES
+
 
 def is_fun_ui_enabled() -> bool:
     """
@@ -20,11 +22,11 @@ def is_fun_ui_enabled() -> bool:
     env_value = os.getenv("CHATCOMPANION_FUN_UI", "").strip().lower()
     
     # Default to enabled if not set or set to enabled values
-    if not env_value or env_value in {"1", "true", "yes", "on"}:
+    if not env_value or env_value in ENV_TRUE_VALUES:
         return True
     
     # Disabled if explicitly set to disabled values
-    if env_value in {"0", "false", "no", "off"}:
+    if env_value in ENV_FALSE_VALUES:
         return False
     
     # Default to enabled for any other value
@@ -5,6 +5,8 @@ Allows bypassing certain UI delays and animations during automated testing.
 
 import os
 
+from app.utils.constants import ENV_TRUE_VALUES
+
 
 def is_test_mode() -> bool:
     """
@@ -16,6 +18,6 @@ def is_test_mode() -> bool:
     Returns:
         True if test mode is enabled, False otherwise
     """
-    test_mode_env = os.environ.get("CHATCOMPANION_TEST_MODE", "").lower()
-    return test_mode_env in {"1", "true", "yes", "on"}
+    test_mode_env = os.environ.get("CHATCOMPANION_TEST_MODE", "").strip().lower()
+    return test_mode_env in ENV_TRUE_VALUES
 
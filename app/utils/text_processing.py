@@ -1,7 +1,19 @@
 """Text processing utilities for chat analysis."""
 
 import re
-from typing import List
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Optional, Tuple
+
+# Sentence boundaries: one or more sentence-ending punctuation marks
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+
+# (speaker, message) pair; speaker is None for unstructured text
+MessagePair = Tuple[Optional[str], str]
+
+# Simple conversation structure: "Speaker: message"
+_MESSAGE_PAIR_RE = re.compile(r"(\w+):\s*(.+?)(?=\n\w+:|$)", re.MULTILINE | re.DOTALL)
 
 
 def normalize_text(text: str) -> str:
@@ -21,6 +33,22 @@ def normalize_text(text: str) -> str:
     return text
 
 
+def segment_sentences_iter(text: str) -> Iterator[str]:
+    """
+    Lazily segment text into sentences.
+
+    Use this instead of segment_sentences() when the sentences are only
+    iterated once, so long chat logs are not materialized as a list.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Iterator over non-empty, stripped sentences
+    """
+    return filter(None, map(str.strip, _SENTENCE_SPLIT_RE.split(text)))
+
+
 def segment_sentences(text: str) -> List[str]:
     """
     Segment text into sentences.
@@ -31,15 +59,33 @@ def segment_sentences(text: str) -> List[str]:
     Returns:
         List of sentences
     """
-    # Simple sentence segmentation
-    # Split on sentence-ending punctuation
-    sentences = re.split(r"[.!?]+", text)
-    # Filter out empty sentences
-    sentences = [s.strip() for s in sentences if s.strip()]
-    return sentences
+    return list(segment_sentences_iter(text))
+
+
+def extract_message_pairs_iter(text: str) -> Iterator[MessagePair]:
+    """
+    Lazily extract message pairs from chat text (if formatted as conversation).
+
+    Args:
+        text: Chat text (may contain speaker labels)
+
+    Yields:
+        (speaker, message) tuples, or a single (None, text) if no structure
+    """
+    found: bool = False
+    for match in _MESSAGE_PAIR_RE.finditer(text):
+        found = True
+        speaker, msg = match.groups()
+        # Chats have few distinct speakers: intern labels so repeated
+        # names share one string object and compare by identity
+        yield (sys.intern(speaker.strip()), msg.strip())
+
+    if not found:
+        # No structure found, return as single message
+        yield (None, text)
 
 
-def extract_message_pairs(text: str) -> List[tuple]:
+def extract_message_pairs(text: str) -> List[MessagePair]:
     """
     Extract message pairs from chat text (if formatted as conversation).
 
@@ -49,15 +95,7 @@ def extract_message_pairs(text: str) -> List[tuple]:
     Returns:
         List of (speaker, message) tuples, or [(None, text)] if no structure
     """
-    # Simple pattern: "Speaker: message"
-    pattern = r"(\w+):\s*(.+?)(?=\n\w+:|$)"
-    matches = re.findall(pattern, text, re.MULTILINE | re.DOTALL)
-
-    if matches:
-        return [(speaker.strip(), msg.strip()) for speaker, msg in matches]
-    else:
-        # No structure found, return as single message
-        return [(None, text)]
+    return list(extract_message_pairs_iter(text))
 
 
 def get_sentence_context(text: str, position: int, window: int = 1) -> str:
@@ -73,26 +111,27 @@ def get_sentence_context(text: str, position: int, window: int = 1) -> str:
         Context string containing the sentence with the position and adjacent sentences
     """
     sentences = segment_sentences(text)
-    
+
+    # Positions are measured in the space-joined sentence string, so the
+    # context window is one slice of it instead of a list slice + join.
+    # bounds[i] is the offset where sentence i + 1 starts (end + delimiter).
+    joined = " ".join(sentences)
+    bounds = list(accumulate(len(sentence) + 1 for sentence in sentences))
+
     # Find which sentence contains the position
-    current_pos = 0
-    sentence_index = -1
-    
-    for i, sentence in enumerate(sentences):
-        sentence_end = current_pos + len(sentence)
-        if current_pos <= position < sentence_end:
-            sentence_index = i
-            break
-        current_pos = sentence_end + 1  # +1 for sentence delimiter
-    
-    if sentence_index == -1:
+    sentence_index = bisect_right(bounds, position)
+    if sentence_index >= len(sentences):
         # Position not found in any sentence, return empty
         return ""
-    
+    sentence_start = bounds[sentence_index - 1] if sentence_index > 0 else 0
+    if position < sentence_start or position >= bounds[sentence_index] - 1:
+        # Position falls on a delimiter, not inside a sentence
+        return ""
+
     # Get context window: sentence_index ± window
     start_idx = max(0, sentence_index - window)
     end_idx = min(len(sentences), sentence_index + window + 1)
-    
-    context_sentences = sentences[start_idx:end_idx]
-    return " ".join(context_sentences)
 
+    char_start = bounds[start_idx - 1] if start_idx > 0 else 0
+    char_end = bounds[end_idx - 1] - 1
+    return joined[char_start:char_end]
@@ -0,0 +1,42 @@
+"""Shared git helpers for the metrics scripts."""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+# Environment variables CI systems use to expose the commit being built
+COMMIT_ENV_VARS = ('GITHUB_SHA', 'CI_COMMIT_SHA', 'BUILDKITE_COMMIT')
+
+_CACHED_SHA: Optional[str] = None
+
+
+def get_commit_hash() -> str:
+    """Get short git commit hash, or 'unknown' if not available.
+    
+    Uses the CI-provided commit SHA when present (no subprocess), otherwise
+    asks git. The result is cached for the lifetime of the process.
+    """
+    global _CACHED_SHA
+    if _CACHED_SHA is not None:
+        return _CACHED_SHA
+    
+    for name in COMMIT_ENV_VARS:
+        sha = os.environ.get(name, '').strip()
+        if sha:
+            _CACHED_SHA = sha[:7]
+            return _CACHED_SHA
+    
+    _CACHED_SHA = 'unknown'
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent.parent
+        )
+        if result.returncode == 0:
+            _CACHED_SHA = result.stdout.strip()
+    except Exception:
+        pass
+    return _CACHED_SHA
@@ -5,71 +5,55 @@ Captures test count, runtime, and metadata for CI/metrics reporting.
 """
 
 import argparse
-import re
+import importlib.util
 import subprocess
 import sys
+import tempfile
+import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from pathlib import Path
 
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from _git import get_commit_hash
 
-def get_git_commit_hash() -> str:
-    """Get short git commit hash, or 'unknown' if not available."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--short', 'HEAD'],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return 'unknown'
+# Run tests across all cores when pytest-xdist is installed
+XDIST_AVAILABLE = importlib.util.find_spec('xdist') is not None
 
 
 def run_pytest_and_parse() -> dict:
-    """Run pytest and parse output for statistics."""
+    """Run pytest and read statistics from its JUnit XML report."""
     try:
-        result = subprocess.run(
-            ['pytest', '-q'],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        
-        output = result.stdout + result.stderr
-        
-        # Parse final line: "XXX passed in Y.Ys" or "XXX passed, Y failed in Y.Ys"
-        # Pattern: (\d+) passed(?:, (\d+) failed)? in ([\d.]+)s
-        pattern = r'(\d+) passed(?:, (\d+) failed)? in ([\d.]+)s'
-        match = re.search(pattern, output)
-        
-        if match:
-            passed = int(match.group(1))
-            failed = int(match.group(2)) if match.group(2) else 0
-            runtime = float(match.group(3))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_path = Path(tmp_dir) / 'junit.xml'
+            pytest_args = ['pytest', '-q', '--no-header', '-p', 'no:logging', '--junitxml', str(report_path)]
+            if XDIST_AVAILABLE:
+                # loadgroup keeps xdist_group-marked tests (the analyze-heavy
+                # detection modules) on one worker, so they share one engine
+                pytest_args += ['-n', 'auto', '--dist=loadgroup']
+            result = subprocess.run(
+                pytest_args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=Path(__file__).parent.parent
+            )
             
-            return {
-                'tests_passed': passed,
-                'tests_failed': failed,
-                'tests_total': passed + failed,
-                'runtime_seconds': runtime,
-                'exit_code': result.returncode,
-            }
-        else:
-            # Fallback: try to find any number followed by "passed"
-            passed_match = re.search(r'(\d+) passed', output)
-            if passed_match:
-                passed = int(passed_match.group(1))
+            if report_path.exists():
+                # Counts live on the <testsuite> element(s) under <testsuites>
+                root = ET.parse(report_path).getroot()
+                suites = [root] if root.tag == 'testsuite' else root.findall('testsuite')
+                total = sum(int(suite.get('tests', 0)) for suite in suites)
+                failed = sum(int(suite.get('failures', 0)) + int(suite.get('errors', 0)) for suite in suites)
+                skipped = sum(int(suite.get('skipped', 0)) for suite in suites)
+                runtime = sum(float(suite.get('time', 0.0)) for suite in suites)
+                
                 return {
-                    'tests_passed': passed,
-                    'tests_failed': 0,
-                    'tests_total': passed,
-                    'runtime_seconds': None,
+                    'tests_passed': total - failed - skipped,
+                    'tests_failed': failed,
+                    'tests_skipped': skipped,
+                    'tests_total': total,
+                    'runtime_seconds': runtime,
                     'exit_code': result.returncode,
                 }
     except Exception as e:
@@ -77,15 +61,17 @@ def run_pytest_and_parse() -> dict:
             'error': str(e),
             'tests_passed': None,
             'tests_failed': None,
+            'tests_skipped': None,
             'tests_total': None,
             'runtime_seconds': None,
             'exit_code': None,
         }
     
     return {
-        'error': 'Could not parse pytest output',
+        'error': 'pytest did not produce a JUnit XML report',
         'tests_passed': None,
         'tests_failed': None,
+        'tests_skipped': None,
         'tests_total': None,
         'runtime_seconds': None,
         'exit_code': None,
@@ -110,6 +96,8 @@ def generate_markdown_output(data: dict) -> str:
             lines.append(f"- **Tests passed:** {data['tests_passed']}")
         if data['tests_failed'] is not None and data['tests_failed'] > 0:
             lines.append(f"- **Tests failed:** {data['tests_failed']}")
+        if data.get('tests_skipped'):
+            lines.append(f"- **Tests skipped:** {data['tests_skipped']}")
         if data['tests_total'] is not None:
             lines.append(f"- **Tests total:** {data['tests_total']}")
         if data['runtime_seconds'] is not None:
@@ -129,7 +117,7 @@ def main(output_json: str = None, output_md: str = None):
     
     # Add metadata
     stats['timestamp'] = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-    stats['commit_hash'] = get_git_commit_hash()
+    stats['commit_hash'] = get_commit_hash()
     
     # Generate Markdown output
     md_output = generate_markdown_output(stats)
@@ -6,45 +6,51 @@ and compares expected vs actual risk levels.
 """
 
 import argparse
+import hashlib
 import json
-import subprocess
+import os
+import sqlite3
 import sys
 from datetime import datetime, timezone
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.detection.engine import DetectionEngine
+from _git import get_commit_hash
 from app.utils.constants import RiskLevel
 
+# numpy and the detection engine (which pulls in the ML stack) are imported
+# where they are used, so --help and argument errors return immediately
+if TYPE_CHECKING:
+    import numpy as np
 
-def get_git_commit_hash() -> str:
-    """Get short git commit hash, or 'unknown' if not available."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--short', 'HEAD'],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return 'unknown'
+    from app.detection.engine import DetectionEngine
+
+# Try to use orjson for faster JSONL parsing, but fall back to stdlib json
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Each worker loads its own model, so a worker only pays off once it gets at
+# least one full embedding batch (app.models_local.classifier.BATCH_SIZE) of chats
+MIN_CHATS_PER_WORKER = 64
+
+# On-disk cache of per-chat analysis results, keyed by chat text + analysis version
+CACHE_PATH = Path(__file__).parent / '.cache' / 'fixture_metrics.sqlite'
 
 
 def load_fixtures(fixture_path: Path) -> List[dict]:
     """Load JSONL fixture file."""
-    chats = []
-    with open(fixture_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                chats.append(json.loads(line))
-    return chats
+    # Both orjson.loads and json.loads accept UTF-8 bytes directly
+    with open(fixture_path, 'rb') as f:
+        data = f.read()
+    return [_json_loads(line) for line in data.split(b'\n') if line.strip()]
 
 
 def normalize_risk_level(risk_str: str) -> str:
@@ -52,28 +58,174 @@ def normalize_risk_level(risk_str: str) -> str:
     return risk_str.lower().strip()
 
 
-def build_confusion_matrix(results: List[dict]) -> Dict[str, Dict[str, int]]:
-    """Build confusion matrix from results."""
-    matrix = {
-        'GREEN': {'GREEN': 0, 'YELLOW': 0, 'RED': 0},
-        'YELLOW': {'GREEN': 0, 'YELLOW': 0, 'RED': 0},
-        'RED': {'GREEN': 0, 'YELLOW': 0, 'RED': 0},
+# Row/column order of the confusion matrix
+LEVEL_NAMES = ['GREEN', 'YELLOW', 'RED']
+LEVEL_INDEX = {RiskLevel.GREEN: 0, RiskLevel.YELLOW: 1, RiskLevel.RED: 2}
+
+# Normalized fixture level string -> RiskLevel (avoids RiskLevel(...) raising)
+RISK_LEVEL_BY_NAME = {level.value.lower(): level for level in RiskLevel}
+
+# Explanation phrases that indicate the "Need Immediate Help?" section
+HELP_SECTION_TOKENS = ('need immediate help', 'immediate help')
+
+
+def build_confusion_matrix(expected_ids: 'np.ndarray', actual_ids: 'np.ndarray') -> Dict[str, Dict[str, int]]:
+    """
+    Build confusion matrix from per-chat level indices.
+    
+    Args:
+        expected_ids: Expected level index (see LEVEL_INDEX) per chat
+        actual_ids: Actual level index per chat
+        
+    Returns:
+        Nested dict mapping expected level name -> actual level name -> count
+    """
+    import numpy as np
+    
+    n_levels = len(LEVEL_NAMES)
+    counts = np.bincount(
+        expected_ids.astype(np.intp) * n_levels + actual_ids, minlength=n_levels * n_levels
+    ).reshape(n_levels, n_levels)
+    
+    return {
+        expected: {actual: int(counts[i, j]) for j, actual in enumerate(LEVEL_NAMES)}
+        for i, expected in enumerate(LEVEL_NAMES)
     }
+
+
+# Process-local detection engine, created once per worker by _init_worker
+_engine: Optional['DetectionEngine'] = None
+
+
+def _init_worker() -> None:
+    """Create the detection engine for this process."""
+    from app.detection.engine import DetectionEngine
     
-    for result in results:
-        expected = result['expected'].value.upper()
-        actual = result['actual'].value.upper()
-        matrix[expected][actual] += 1
+    global _engine
+    _engine = DetectionEngine(use_ml=True)
+
+
+def _analyze_chunk(chats: List[Tuple[RiskLevel, str]]) -> List[Tuple[RiskLevel, RiskLevel, str, bool]]:
+    """
+    Analyze a chunk of fixture chats with the process-local engine.
     
-    return matrix
+    The whole chunk goes through DetectionEngine.analyze_batch, so in hybrid
+    mode its sentences are embedded in a single batch.
+    
+    Args:
+        chats: List of (expected risk level, chat text) tuples
+        
+    Returns:
+        List of (expected level, actual level, explanation, whether any matches were found)
+    """
+    results = _engine.analyze_batch([chat_text for _, chat_text in chats])
+    return [
+        (expected_level, result.risk_level, result.explanation,
+         bool(result.matches and any(result.matches.values())))
+        for (expected_level, _), result in zip(chats, results)
+    ]
 
 
-def compute_metrics(fixture_path: Path, output_json: Optional[str] = None, output_md: Optional[str] = None):
-    """Compute accuracy metrics from fixture data."""
-    chats = load_fixtures(fixture_path)
+def _embedding_backend() -> Tuple[str, Optional[Path]]:
+    """
+    Determine which encoder EmbeddingModel will load, using the same precedence.
     
-    # Initialize detection engine
-    engine = DetectionEngine(use_ml=True)
+    Returns:
+        Tuple of (backend name, model path): ('onnx', dir), ('pytorch', path),
+        or ('rules', None) when no model can be loaded
+    """
+    from app.models_local.embeddings import ONNX_AVAILABLE, SENTENCE_TRANSFORMERS_AVAILABLE
+    from app.models_local.loader import ModelLoader
+    
+    model_name = 'all-MiniLM-L6-v2'
+    loader = ModelLoader()
+    if ONNX_AVAILABLE and loader.get_quantized_model_path(model_name) is not None:
+        return 'onnx', loader.models_dir / model_name
+    model_path = loader.get_model_path(model_name) if SENTENCE_TRANSFORMERS_AVAILABLE else None
+    if model_path is not None:
+        return 'pytorch', model_path
+    return 'rules', None
+
+
+def compute_analysis_version() -> str:
+    """
+    Fingerprint everything that can change an analysis result.
+    
+    Covers the source and config files under app/, the embedding backend that
+    will be loaded (int8 ONNX, PyTorch or rules-only), and the size and mtime
+    of every model file, so editing rules or code, switching backends, or
+    re-downloading/re-quantizing the model invalidates cached results.
+    
+    Returns:
+        Hex digest identifying the current analysis behavior
+    """
+    app_dir = Path(__file__).parent.parent / 'app'
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(app_dir.rglob('*')):
+        if path.suffix in ('.py', '.yaml', '.yml') and path.is_file():
+            digest.update(str(path.relative_to(app_dir)).encode())
+            digest.update(path.read_bytes())
+    
+    backend, model_path = _embedding_backend()
+    digest.update(backend.encode())
+    if model_path is not None:
+        model_files = [model_path] if model_path.is_file() else sorted(model_path.rglob('*'))
+        for path in model_files:
+            if path.is_file():
+                stat = path.stat()
+                digest.update(f'{path.relative_to(model_path.parent)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()
+
+
+def open_cache(cache_path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the analysis result cache."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS cache ('
+        'key TEXT PRIMARY KEY, actual TEXT, explanation TEXT, has_matches INTEGER)'
+    )
+    return conn
+
+
+def cache_key(chat_text: str, version: str) -> str:
+    """Build the cache key for a chat under a given analysis version."""
+    return hashlib.blake2b(chat_text.encode('utf-8') + version.encode(), digest_size=16).hexdigest()
+
+
+def compute_metrics(
+    fixture_path: Path,
+    output_json: Optional[str] = None,
+    output_md: Optional[str] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+):
+    """Compute accuracy metrics from fixture data.
+    
+    Fewer than 2 * MIN_CHATS_PER_WORKER pending chats are analyzed as a single
+    batch in this process. Larger runs are split into chunks of at least
+    MIN_CHATS_PER_WORKER chats across a process pool; each worker keeps its own
+    warm DetectionEngine and analyzes a chunk with one analyze_batch call.
+    Pass workers=1 to always analyze serially.
+    
+    With use_cache, results are stored in CACHE_PATH and chats whose text and
+    analysis version are unchanged since a previous run are not re-analyzed.
+    """
+    import numpy as np
+    
+    fixtures = load_fixtures(fixture_path)
+    
+    # Collect valid (expected level, chat text) pairs
+    chats = []
+    for chat in fixtures:
+        # Map expected string to RiskLevel enum (None for missing/unknown levels)
+        expected_level = RISK_LEVEL_BY_NAME.get(normalize_risk_level(chat.get('risk_expected', '')))
+        chat_text = chat.get('chat_text', '')
+        
+        if expected_level is None or not chat_text:
+            continue
+        
+        chats.append((expected_level, chat_text))
     
     # Counters per level
     counts = {
@@ -82,37 +234,75 @@ def compute_metrics(fixture_path: Path, output_json: Optional[str] = None, outpu
         RiskLevel.RED: {'correct': 0, 'total': 0},
     }
     
-    # Store all results for confusion matrix and validation
-    all_results = []
     help_section_red_only_count = 0
     help_section_non_red_count = 0
     evidence_violations = 0
     
-    # Process each chat
-    for chat in chats:
-        expected_str = normalize_risk_level(chat.get('risk_expected', ''))
-        chat_text = chat.get('chat_text', '')
-        
-        if not expected_str or not chat_text:
-            continue
-        
-        # Map expected string to RiskLevel enum
-        try:
-            expected_level = RiskLevel(expected_str)
-        except ValueError:
-            continue
-        
-        # Run analysis
-        result = engine.analyze(chat_text)
-        actual_level = result.risk_level
-        
-        # Store result for confusion matrix
-        all_results.append({
-            'expected': expected_level,
-            'actual': actual_level,
-            'explanation': result.explanation,
-            'matches': result.matches,
-        })
+    # Look up previously analyzed chats in the cache
+    cache = open_cache(CACHE_PATH) if use_cache else None
+    cached_results = []
+    pending = chats
+    if cache is not None:
+        version = compute_analysis_version()
+        keys = [cache_key(chat_text, version) for _, chat_text in chats]
+        pending, pending_keys = [], []
+        for (expected_level, chat_text), key in zip(chats, keys):
+            row = cache.execute(
+                'SELECT actual, explanation, has_matches FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                pending.append((expected_level, chat_text))
+                pending_keys.append(key)
+            else:
+                cached_results.append((expected_level, RiskLevel(row[0]), row[1], bool(row[2])))
+    
+    # Analyze remaining chats in chunks (order does not matter for the aggregated counts)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(pending) // MIN_CHATS_PER_WORKER))
+    pool = None
+    if not pending:
+        analyzed = []
+    elif workers == 1:
+        _init_worker()
+        analyzed = _analyze_chunk(pending)
+    else:
+        chunksize = max(MIN_CHATS_PER_WORKER, len(pending) // (4 * workers))
+        chunks = [pending[i:i + chunksize] for i in range(0, len(pending), chunksize)]
+        pool = Pool(workers, initializer=_init_worker)
+        # Ordered imap keeps results aligned with pending_keys for the cache
+        analyze_chunks = pool.imap if cache is not None else pool.imap_unordered
+        analyzed = (
+            item
+            for chunk_results in analyze_chunks(_analyze_chunk, chunks)
+            for item in chunk_results
+        )
+    
+    try:
+        fresh_results = list(analyzed)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    
+    # Store fresh results in a single transaction
+    if cache is not None:
+        with cache:
+            cache.executemany(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                [
+                    (key, actual_level.value, explanation, int(has_matches))
+                    for key, (_, actual_level, explanation, has_matches) in zip(pending_keys, fresh_results)
+                ],
+            )
+        cache.close()
+    
+    # Tally cached and freshly analyzed results
+    all_results = cached_results + fresh_results
+    expected_ids = np.empty(len(all_results), dtype=np.int8)
+    actual_ids = np.empty(len(all_results), dtype=np.int8)
+    for i, (expected_level, actual_level, explanation, has_matches) in enumerate(all_results):
+        # Store level indices for confusion matrix
+        expected_ids[i] = LEVEL_INDEX[expected_level]
+        actual_ids[i] = LEVEL_INDEX[actual_level]
         
         # Update counters
         counts[expected_level]['total'] += 1
@@ -120,8 +310,8 @@ def compute_metrics(fixture_path: Path, output_json: Optional[str] = None, outpu
             counts[expected_level]['correct'] += 1
         
         # Check "Need Immediate Help?" appears only for RED
-        explanation_lower = result.explanation.lower()
-        has_help_section = 'need immediate help' in explanation_lower or 'immediate help' in explanation_lower
+        explanation_lower = explanation.lower()
+        has_help_section = any(token in explanation_lower for token in HELP_SECTION_TOKENS)
         
         if has_help_section:
             if actual_level == RiskLevel.RED:
@@ -132,7 +322,6 @@ def compute_metrics(fixture_path: Path, output_json: Optional[str] = None, outpu
         # Check evidence-based behaviors (approximate)
         # If explanation mentions "observed behavior" but matches is empty, flag it
         has_observed_behavior = 'observed behavior' in explanation_lower or 'observed behaviors' in explanation_lower
-        has_matches = result.matches and any(result.matches.values())
         
         if has_observed_behavior and not has_matches:
             evidence_violations += 1
@@ -142,10 +331,10 @@ def compute_metrics(fixture_path: Path, output_json: Optional[str] = None, outpu
     total_correct = sum(c['correct'] for c in counts.values())
     
     # Build confusion matrix
-    confusion_matrix = build_confusion_matrix(all_results)
+    confusion_matrix = build_confusion_matrix(expected_ids, actual_ids)
     
     # Get metadata
-    commit_hash = get_git_commit_hash()
+    commit_hash = get_commit_hash()
     timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
     
     # Prepare output data
@@ -259,6 +448,11 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Compute accuracy metrics from test fixtures')
     parser.add_argument('--json', type=str, help='Output JSON to file')
     parser.add_argument('--md', type=str, help='Output Markdown to file')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maximum number of worker processes (default: CPU count, 1 = serial); '
+                             f'each worker gets at least {MIN_CHATS_PER_WORKER} chats')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Re-analyze every chat instead of reusing results from {CACHE_PATH.name}')
     
     args = parser.parse_args()
     
@@ -270,4 +464,5 @@ if __name__ == '__main__':
         print(f"Error: Fixture file not found: {fixture_path}", file=sys.stderr)
         sys.exit(1)
     
-    compute_metrics(fixture_path, output_json=args.json, output_md=args.md)
+    compute_metrics(fixture_path, output_json=args.json, output_md=args.md, workers=args.workers,
+                    use_cache=not args.no_cache)
@@ -11,6 +11,8 @@ Usage:
 Models will be stored in: models/
 """
 
+import importlib.util
+import os
 import sys
 from pathlib import Path
 
@@ -18,7 +20,110 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.models_local.loader import ModelLoader
+from app.models_local.loader import QUANTIZED_ONNX_FILE, ModelLoader
+
+# Files in the HuggingFace repo that ChatCompanion never loads
+# (other frameworks' weights and upstream ONNX/OpenVINO exports)
+IGNORE_PATTERNS = [
+    "onnx/*",
+    "openvino/*",
+    "*.h5",
+    "*.msgpack",
+    "*.ot",
+    "pytorch_model.bin",
+]
+
+
+# Largest allowed change in any reference-phrase cosine similarity between the
+# fp32 and int8 models (the classifier's score thresholds were tuned on fp32)
+PARITY_TOLERANCE = 0.02
+
+
+def check_quantized_parity(model_dir: Path) -> bool:
+    """
+    Compare the int8 ONNX model with the fp32 model on the reference phrases.
+
+    RiskClassifier scores are cosine similarities against REFERENCE_PHRASES, so
+    the pairwise similarities of those phrases must survive quantization.
+
+    Args:
+        model_dir: Directory containing the fp32 model and its int8 export
+
+    Returns:
+        True if no similarity moved by more than PARITY_TOLERANCE
+    """
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    from app.models_local.classifier import REFERENCE_PHRASES
+    from app.models_local.embeddings import OnnxSentenceEncoder
+
+    phrases = [phrase for category_phrases in REFERENCE_PHRASES.values() for phrase in category_phrases]
+    fp32 = SentenceTransformer(str(model_dir)).encode(phrases, normalize_embeddings=True)
+    int8 = OnnxSentenceEncoder(model_dir, model_dir / QUANTIZED_ONNX_FILE).encode(phrases)
+
+    # Both embeddings are L2-normalized, so the dot products are cosine similarities
+    max_drift = float(np.abs(fp32 @ fp32.T - int8 @ int8.T).max())
+    print(f"  Max reference similarity drift (fp32 vs int8): {max_drift:.4f}")
+    return max_drift <= PARITY_TOLERANCE
+
+
+def quantize_model(model_dir: Path) -> bool:
+    """
+    Export a saved model to ONNX and quantize it to int8 (optional step).
+
+    The quantized file is written to model_dir / QUANTIZED_ONNX_FILE, where
+    EmbeddingModel picks it up in preference to the PyTorch weights. It is
+    therefore only kept if it passes check_quantized_parity.
+
+    Args:
+        model_dir: Directory the sentence-transformer model was downloaded to
+
+    Returns:
+        True if the quantized model was written, False if skipped or failed
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError:
+        print("Skipping ONNX quantization (optimum[onnxruntime] not installed).")
+        print("  Install it with: pip install -r requirements-optional.txt")
+        return False
+
+    quantized_path = model_dir / QUANTIZED_ONNX_FILE
+    try:
+        onnx_dir = quantized_path.parent
+
+        # Export the transformer to ONNX, then apply dynamic int8 quantization
+        ort_model = ORTModelForFeatureExtraction.from_pretrained(str(model_dir), export=True)
+        ort_model.save_pretrained(str(onnx_dir))
+
+        # AVX2 config with 7-bit reduce_range: the 8-bit avx512_vnni config
+        # saturates on x86 CPUs without VNNI
+        quantizer = ORTQuantizer.from_pretrained(str(onnx_dir))
+        quantization_config = AutoQuantizationConfig.avx2(
+            is_static=False, per_channel=False, reduce_range=True
+        )
+        quantizer.quantize(save_dir=str(onnx_dir), quantization_config=quantization_config)
+    except Exception as e:
+        print(f"WARNING: ONNX quantization failed: {e}")
+        print("The PyTorch model will be used instead.")
+        return False
+
+    if not quantized_path.exists():
+        return False
+
+    try:
+        parity_ok = check_quantized_parity(model_dir)
+    except Exception as e:
+        print(f"WARNING: Could not check int8 model against fp32: {e}")
+        parity_ok = False
+    if not parity_ok:
+        quantized_path.unlink()
+        print("Discarded the int8 model; the PyTorch model will be used instead.")
+        return False
+
+    return True
 
 
 def download_models():
@@ -43,6 +148,11 @@ def download_models():
         print(f"✓ Model '{model_name}' already exists.")
         print(f"  Location: {loader.get_model_path(model_name)}")
         print()
+        # Non-interactive runs (e.g. CI restoring models/ from a cache) keep
+        # the existing model instead of blocking on the prompt
+        if not sys.stdin.isatty():
+            print("Non-interactive session - keeping existing model.")
+            return
         response = input("Download again? (y/N): ").strip().lower()
         if response != 'y':
             print("Skipping download.")
@@ -53,15 +163,26 @@ def download_models():
     print()
     
     try:
-        from sentence_transformers import SentenceTransformer
+        # Use the parallel Rust downloader when it is installed. huggingface_hub
+        # reads this flag once at import, so it must be set before the import.
+        if importlib.util.find_spec("hf_transfer") is not None:
+            os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+        
+        from huggingface_hub import snapshot_download
         
-        # Download model - this will save to cache first, then we copy to models/
-        print("Step 1: Downloading from HuggingFace...")
-        model = SentenceTransformer(model_name)
+        # Download model files straight into models/ (no cache-then-save round trip)
+        print(f"Step 1: Downloading from HuggingFace to {models_dir}...")
+        snapshot_download(
+            repo_id=f"sentence-transformers/{model_name}",
+            local_dir=str(models_dir / model_name),
+            ignore_patterns=IGNORE_PATTERNS,
+            max_workers=8,
+        )
         
-        # Save to local models directory
-        print(f"Step 2: Saving to {models_dir}...")
-        model.save(str(models_dir / model_name))
+        # Optional: int8 ONNX export for faster CPU inference
+        print("Step 2: Quantizing to int8 ONNX (optional)...")
+        if quantize_model(models_dir / model_name):
+            print(f"  Quantized model: {models_dir / model_name / QUANTIZED_ONNX_FILE}")
         
         print()
         print("=" * 60)
@@ -74,7 +195,7 @@ def download_models():
         print("Runtime will be completely offline - no network calls.")
         
     except ImportError:
-        print("ERROR: sentence-transformers not installed.")
+        print("ERROR: huggingface_hub not installed (it ships with sentence-transformers).")
         print("Please install dependencies first:")
         print("  pip install -r requirements.txt")
         sys.exit(1)
@@ -6,18 +6,32 @@ Scans the repository for disallowed patterns that should not be committed.
 Focuses on real leaks: sensitive file paths, secret patterns, and internal artifacts.
 
 Usage:
-    python scripts/repo_hygiene_check.py
+    python scripts/repo_hygiene_check.py [--no-cache]
 
 Exit codes:
     0: No violations found
     1: Violations found
 """
 
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import mmap
 import os
+from concurrent.futures import ProcessPoolExecutor
 import re
+import subprocess
 import sys
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple, Optional, Union
+
+# Try to use RE2 for a single-pass multi-pattern secret scan, but fall back to re
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Disallowed file paths/patterns (case-insensitive, must match full path or filename)
 DISALLOWED_PATHS = [
@@ -45,6 +59,13 @@ DISALLOWED_FILENAMES = [
     r"master_prompt",
 ]
 
+# Compiled once: each list as individual patterns (to report every match) and
+# as a single alternation, so the common no-match case costs one search
+_PATH_RES = [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in DISALLOWED_PATHS]
+_PATH_ANY_RE = re.compile("|".join(f"(?:{p})" for p in DISALLOWED_PATHS), re.IGNORECASE)
+_FILENAME_RES = [(pattern, re.compile(pattern)) for pattern in DISALLOWED_FILENAMES]
+_FILENAME_ANY_RE = re.compile("|".join(f"(?:{p})" for p in DISALLOWED_FILENAMES))
+
 # Secret-like content patterns (regex) - only strong signatures
 SECRET_PATTERNS = [
     (r"BEGIN\s+(RSA\s+)?PRIVATE\s+KEY", "Private key detected"),
@@ -64,6 +85,27 @@ SECRET_PATTERNS = [
     (r"mysql://[^:]+:[^@]+@", "MySQL connection string with credentials detected"),
 ]
 
+# Compiled once: (regex, message, allowlist key) per secret pattern
+_SECRET_RES = [
+    (re.compile(pattern, re.IGNORECASE), message, pattern.split()[0].lower() if pattern.split() else "")
+    for pattern, message in SECRET_PATTERNS
+]
+_SECRET_ANY_RE = re.compile("|".join(f"(?:{p})" for p, _ in SECRET_PATTERNS), re.IGNORECASE)
+# Bytes versions for scanning mapped ASCII files without decoding them
+_SECRET_BYTES_RES = [re.compile(pattern.encode(), re.IGNORECASE) for pattern, _ in SECRET_PATTERNS]
+_SECRET_ANY_BYTES_RE = re.compile(_SECRET_ANY_RE.pattern.encode(), re.IGNORECASE)
+_NON_ASCII_RE = re.compile(rb"[\x80-\xff]")
+
+if re2 is not None:
+    _re2_options = re2.Options()
+    _re2_options.case_sensitive = False
+    _SECRET_SET = re2.Set.SearchSet(_re2_options)
+    for _pattern, _ in SECRET_PATTERNS:
+        _SECRET_SET.Add(_pattern)
+    _SECRET_SET.Compile()
+else:
+    _SECRET_SET = None
+
 # Allowed directories (excluded from scanning)
 ALLOWED_DIRS = [
     ".git",
@@ -76,6 +118,11 @@ ALLOWED_DIRS = [
     "models",  # Model files are large and gitignored
 ]
 
+_ALLOWED_DIR_SET = frozenset(ALLOWED_DIRS)
+
+# Directory names pruned by the fallback walker (with and without the leading dot)
+_WALK_SKIP_DIRS = _ALLOWED_DIR_SET | frozenset(d.lstrip(".") for d in ALLOWED_DIRS)
+
 # Allowlist: files that may contain false positives
 ALLOWLIST = {
     # File path -> allowed patterns in filename or content
@@ -87,160 +134,321 @@ ALLOWLIST = {
     "scripts/repo_hygiene_check.py": ["postgresql", "mysql", "mongodb"],  # Contains regex patterns for detection
 }
 
+# Common binary extensions, skipped without opening the file
+BINARY_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip', '.tar', '.gz',
+    '.so', '.dll', '.exe', '.bin', '.safetensors', '.pt', '.pth', '.onnx',
+})
+
+# Relative POSIX path -> indices of SECRET_PATTERNS skipped for that file
+_ALLOWLIST_SKIP: Dict[str, FrozenSet[int]] = {
+    allowed_path: frozenset(
+        index for index, (_, _, pattern_key) in enumerate(_SECRET_RES)
+        if any(allowed in pattern_key for allowed in patterns)
+    )
+    for allowed_path, patterns in ALLOWLIST.items()
+}
+
 # Maximum file size to scan for content (1MB)
 MAX_FILE_SIZE = 1024 * 1024
 
+# Per-file content results from the last run, reused while (mtime, size) is unchanged
+CACHE_PATH = Path(__file__).parent / '.cache' / 'repo_hygiene.json'
+
+# Below this many files, process pool startup costs more than the scan itself
+PARALLEL_SCAN_MIN_FILES = 2000
+
 
 def is_allowed_path(file_path: Path) -> bool:
     """Check if a file path should be excluded from scanning."""
-    # Check if path is in an allowed directory
-    for allowed_dir in ALLOWED_DIRS:
-        if allowed_dir in file_path.parts:
-            return True
-    return False
+    # Check if any path component is an allowed directory
+    return not _ALLOWED_DIR_SET.isdisjoint(file_path.parts)
 
 
 def check_path_patterns(file_path: Path) -> List[str]:
     """Check if file path matches disallowed patterns."""
-    violations = []
-    path_str = str(file_path).lower()
+    path_str = str(file_path)
     
-    for pattern in DISALLOWED_PATHS:
-        if re.search(pattern, path_str, re.IGNORECASE):
-            violations.append(f"Path matches disallowed pattern: '{pattern}'")
+    if not _PATH_ANY_RE.search(path_str):
+        return []
     
-    return violations
+    return [
+        f"Path matches disallowed pattern: '{pattern}'"
+        for pattern, regex in _PATH_RES
+        if regex.search(path_str)
+    ]
 
 
 def check_filename_patterns(filename: str) -> List[str]:
     """Check if filename matches disallowed patterns."""
-    violations = []
     filename_lower = filename.lower()
     
-    for pattern in DISALLOWED_FILENAMES:
-        if re.search(pattern, filename_lower):
-            violations.append(f"Filename matches disallowed pattern: '{pattern}'")
+    if not _FILENAME_ANY_RE.search(filename_lower):
+        return []
     
-    return violations
+    return [
+        f"Filename matches disallowed pattern: '{pattern}'"
+        for pattern, regex in _FILENAME_RES
+        if regex.search(filename_lower)
+    ]
 
 
-def is_binary_file(file_path: Path) -> bool:
-    """Check if file is binary by looking for null bytes."""
-    try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(8192)  # Read first 8KB
-            return b'\x00' in chunk
-    except (OSError, PermissionError):
-        return True  # Assume binary if we can't read
+def decode_text(data: bytes) -> str:
+    """Decode file bytes exactly as open(path, 'r', encoding='utf-8', errors='ignore') would."""
+    return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='ignore').read()
+
+
+def find_secret_candidates(text: Union[str, bytes]) -> List[int]:
+    """Return indices of SECRET_PATTERNS that match anywhere in text, in pattern order."""
+    if _SECRET_SET is not None:
+        return sorted(_SECRET_SET.Match(text) or [])
     
-    # Also check common binary extensions
-    binary_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip', '.tar', '.gz', 
-                         '.so', '.dll', '.exe', '.bin', '.safetensors', '.pt', '.pth', '.onnx'}
-    return file_path.suffix.lower() in binary_extensions
+    if isinstance(text, str):
+        any_re, regexes = _SECRET_ANY_RE, [regex for regex, _, _ in _SECRET_RES]
+    else:
+        any_re, regexes = _SECRET_ANY_BYTES_RE, _SECRET_BYTES_RES
+    
+    # Most files contain no secrets at all: one alternation search rules them out
+    if not any_re.search(text):
+        return []
+    return [index for index, regex in enumerate(regexes) if regex.search(text)]
 
 
-def check_file_content(file_path: Path) -> List[Tuple[int, str]]:
-    """Check file content for secret patterns. Returns list of (line_number, violation)."""
+def check_file_content(file_path: Path, repo_root: Path, size: Optional[int] = None) -> List[Tuple[int, str]]:
+    """
+    Check file content for secret patterns. Returns list of (line_number, violation).
+    
+    Pass size when the caller has already stat'ed the file to avoid a second stat.
+    """
     violations = []
     
-    # Skip binary files
-    if is_binary_file(file_path):
+    # Skip known binary extensions before touching the file system
+    if file_path.suffix.lower() in BINARY_EXTENSIONS:
         return violations
     
-    # Check if file is too large
-    try:
-        if file_path.stat().st_size > MAX_FILE_SIZE:
-            return violations  # Skip large files
-    except OSError:
-        return violations  # Skip if can't read
+    # Check if file is empty or too large
+    if size is None:
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            return violations  # Skip if missing or can't read
+    if size == 0 or size > MAX_FILE_SIZE:
+        return violations
     
     # Check allowlist
-    rel_path = str(file_path)
-    allowed_patterns = []
-    for allowed_path, patterns in ALLOWLIST.items():
-        if allowed_path in rel_path:
-            allowed_patterns.extend(patterns)
+    skipped = _ALLOWLIST_SKIP.get(file_path.relative_to(repo_root).as_posix(), frozenset())
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                # Skip comments in code files (reduce false positives)
-                stripped = line.strip()
-                if stripped.startswith('#') or stripped.startswith('//') or stripped.startswith('*'):
-                    # Still check for strong signatures even in comments
-                    pass
-                
-                for pattern, message in SECRET_PATTERNS:
-                    # Skip if pattern is in allowlist
-                    pattern_key = pattern.split()[0].lower() if pattern.split() else ""
-                    if any(allowed in pattern_key for allowed in allowed_patterns):
-                        continue
-                    
-                    if re.search(pattern, line, re.IGNORECASE):
-                        # Do NOT include context with secrets - only show the warning message
-                        # This prevents logging sensitive data in violation output
-                        violations.append((line_num, message))
-    except (UnicodeDecodeError, PermissionError, OSError):
-        # Skip binary files or files we can't read
-        pass
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Skip binary files (null byte in the first 8KB)
+            if b'\x00' in data[:8192]:
+                return violations
+            
+            if _NON_ASCII_RE.search(data):
+                # Unicode case folding and dropped invalid bytes only match on decoded text
+                text = decode_text(data[:])
+                candidates = find_secret_candidates(text)
+            else:
+                # ASCII: scan the mapped bytes directly and decode only on a hit
+                text = None
+                candidates = find_secret_candidates(data)
+            
+            candidates = [index for index in candidates if index not in skipped]
+            if not candidates:
+                return violations
+            if text is None:
+                text = decode_text(data[:])
+    except (ValueError, PermissionError, OSError):
+        # Skip files we can't read or map
+        return violations
+    
+    # Confirm line by line so line numbers and per-line semantics are unchanged
+    for line_num, line in enumerate(io.StringIO(text), 1):
+        for index in candidates:
+            regex, message, _ = _SECRET_RES[index]
+            if regex.search(line):
+                # Do NOT include context with secrets - only show the warning message
+                # This prevents logging sensitive data in violation output
+                violations.append((line_num, message))
     
     return violations
 
 
-def scan_repository(repo_root: Path) -> List[Tuple[Path, List[str], List[Tuple[int, str]]]]:
-    """Scan repository for violations. Returns list of (file_path, path_violations, content_violations)."""
-    violations = []
+def _scan_one(
+    file_path: Path, repo_root: Path, cached: Optional[list] = None
+) -> Optional[Tuple[List[str], List[Tuple[int, str]], list]]:
+    """
+    Scan a single file.
     
-    # Get all tracked files from git
+    Args:
+        file_path: File to scan
+        repo_root: Repository root, for allowlist lookups
+        cached: Cache entry [mtime_ns, size, content_violations] from a previous run, if any
+        
+    Returns:
+        (path_violations, content_violations, cache_entry), or None if the file doesn't exist
+    """
+    # Skip if file doesn't exist (might be deleted)
     try:
-        import subprocess
-        result = subprocess.run(
-            ["git", "ls-files"],
+        st = file_path.stat()
+    except OSError:
+        return None
+    
+    # Check path patterns
+    path_violations = check_path_patterns(file_path)
+    
+    # Check filename patterns
+    filename_violations = check_filename_patterns(file_path.name)
+    path_violations.extend(filename_violations)
+    
+    # Check file content for secrets, unless it is unchanged since the last run
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        content_violations = [tuple(violation) for violation in cached[2]]
+    else:
+        content_violations = check_file_content(file_path, repo_root, st.st_size)
+    
+    return path_violations, content_violations, [st.st_mtime_ns, st.st_size, content_violations]
+
+
+def compute_cache_version() -> str:
+    """Hash this script so edited patterns or allowlists invalidate the cache."""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+
+
+def load_cache(cache_path: Path, version: str) -> dict:
+    """Load cached per-file results, or an empty dict if missing, corrupt or stale."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    return data.get('files', {})
+
+
+def save_cache(cache_path: Path, version: str, files: dict) -> None:
+    """Write per-file results for the next run. Failures are ignored."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'files': files}, f)
+    except OSError:
+        pass
+
+
+def iter_tracked_files(repo_root: Path) -> Iterator[str]:
+    """
+    Yield repository-relative paths of tracked files as git lists them.
+    
+    Paths are streamed from `git ls-files` so scanning can start before git has
+    finished enumerating. Falls back to walking the tree if git is unavailable.
+    
+    Keep this a single plain `git ls-files -z` call. Flags like --modified or
+    --deleted make git compare the index against the work tree and slow the
+    listing down; if staged status is ever needed, ask `git diff-index --cached`
+    separately instead.
+    """
+    seen = set()
+    try:
+        with subprocess.Popen(
+            ["git", "ls-files", "-z"],
             cwd=repo_root,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        tracked_files = result.stdout.strip().split("\n")
-        tracked_files = [f for f in tracked_files if f]  # Remove empty strings
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fallback: scan all files if git is not available
-        tracked_files = []
-        for root, dirs, files in os.walk(repo_root):
-            # Skip allowed directories
-            dirs[:] = [d for d in dirs if d not in [a.lstrip(".") for a in ALLOWED_DIRS]]
-            for file in files:
-                rel_path = os.path.relpath(os.path.join(root, file), repo_root)
-                tracked_files.append(rel_path)
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ) as proc:
+            # NUL-separated raw bytes: no quoting of unusual names, no text decoding pass
+            pending = b""
+            for chunk in iter(lambda: proc.stdout.read1(65536), b""):
+                *names, pending = (pending + chunk).split(b"\0")
+                for name in names:
+                    if name:
+                        file_path_str = os.fsdecode(name)
+                        seen.add(file_path_str)
+                        yield file_path_str
+        if proc.returncode == 0:
+            return
+    except FileNotFoundError:
+        pass
     
-    for file_path_str in tracked_files:
-        file_path = repo_root / file_path_str
+    # Fallback: scan all files if git is not available
+    for rel_path in _walk_files(str(repo_root), ""):
+        if rel_path not in seen:
+            yield rel_path
+
+
+def _walk_files(directory: str, rel_dir: str) -> Iterator[str]:
+    """Yield paths relative to the walk root, pruning _WALK_SKIP_DIRS without a stat."""
+    try:
+        with os.scandir(directory) as entries:
+            # Materialize so the directory handle is closed before recursing
+            entries = list(entries)
+    except OSError:
+        return
+    for entry in entries:
+        rel_path = os.path.join(rel_dir, entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in _WALK_SKIP_DIRS:
+                yield from _walk_files(entry.path, rel_path)
+        else:
+            yield rel_path
+
+
+def scan_repository(
+    repo_root: Path, use_cache: bool = True
+) -> List[Tuple[Path, List[str], List[Tuple[int, str]]]]:
+    """Scan repository for violations. Returns list of (file_path, path_violations, content_violations)."""
+    # Skip allowed directories before handing work to the scanner
+    pending = (f for f in iter_tracked_files(repo_root) if not is_allowed_path(repo_root / f))
+    
+    version = compute_cache_version() if use_cache else ''
+    cache = load_cache(CACHE_PATH, version) if use_cache else {}
+    
+    # Small repositories are scanned inline once git's listing runs out early
+    tracked_files = list(itertools.islice(pending, PARALLEL_SCAN_MIN_FILES))
+    if len(tracked_files) < PARALLEL_SCAN_MIN_FILES:
+        results = [
+            _scan_one(repo_root / file_path_str, repo_root, cache.get(file_path_str))
+            for file_path_str in tracked_files
+        ]
+    else:
+        # Keep submitting paths as git produces them. Compiled patterns live at
+        # module level, so workers get them on import/fork
+        remaining = []
         
-        # Skip if file doesn't exist (might be deleted)
-        if not file_path.exists():
-            continue
+        def collect(file_path_strs: Iterable[str]) -> Iterator[str]:
+            for file_path_str in file_path_strs:
+                remaining.append(file_path_str)
+                yield file_path_str
         
-        # Skip if in allowed directory
-        if is_allowed_path(file_path):
+        path_strs, cache_keys = itertools.tee(itertools.chain(tracked_files, collect(pending)))
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(
+                _scan_one,
+                (repo_root / file_path_str for file_path_str in path_strs),
+                itertools.repeat(repo_root),
+                (cache.get(file_path_str) for file_path_str in cache_keys),
+                chunksize=64,
+            ))
+        tracked_files.extend(remaining)
+    
+    violations = []
+    new_cache = {}
+    for file_path_str, result in zip(tracked_files, results):
+        if result is None:
             continue
-        
-        # Check path patterns
-        path_violations = check_path_patterns(file_path)
-        
-        # Check filename patterns
-        filename_violations = check_filename_patterns(file_path.name)
-        path_violations.extend(filename_violations)
-        
-        # Check file content for secrets
-        content_violations = check_file_content(file_path)
-        
+        path_violations, content_violations, cache_entry = result
+        new_cache[file_path_str] = cache_entry
         if path_violations or content_violations:
-            violations.append((file_path, path_violations, content_violations))
+            violations.append((repo_root / file_path_str, path_violations, content_violations))
+    
+    if use_cache:
+        save_cache(CACHE_PATH, version, new_cache)
     
     return violations
 
 
-def main():
+def main(use_cache: bool = True):
     """Main entry point."""
     repo_root = Path(__file__).parent.parent
     
@@ -248,7 +456,7 @@ def main():
     print(f"Repository root: {repo_root}")
     print()
     
-    violations = scan_repository(repo_root)
+    violations = scan_repository(repo_root, use_cache=use_cache)
     
     if violations:
         print("❌ VIOLATIONS FOUND:")
@@ -284,4 +492,10 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description="Scan the repository for hygiene violations")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rescan every file instead of reusing results for unchanged files")
+    
+    args = parser.parse_args()
+    
+    sys.exit(main(use_cache=not args.no_cache))
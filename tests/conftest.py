@@ -0,0 +1,78 @@
+"""Shared pytest fixtures."""
+
+import os
+from functools import lru_cache
+
+import pytest
+
+
+def pytest_configure(config):
+    """Register custom markers, including xdist's for runs without pytest-xdist."""
+    config.addinivalue_line("markers", "slow: detection engine integration tests")
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run tests with the same group name on one xdist worker"
+    )
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Rules-only detection engine, built once and shared across tests."""
+    # Imported here so collection (e.g. with -k or -m) doesn't load the detection stack
+    from app.detection.engine import DetectionEngine
+    return DetectionEngine(use_ml=False)
+
+
+@pytest.fixture(scope="session")
+def rule_engine():
+    """Pattern rule engine, loading the rule files once per session."""
+    from app.rules.rule_engine import RuleEngine
+    return RuleEngine()
+
+
+@pytest.fixture(scope="session")
+def analyze(engine):
+    """engine.analyze memoized by text, for tests that only read the result."""
+    return lru_cache(maxsize=None)(engine.analyze)
+
+
+@pytest.fixture(scope="session")
+def detection_engine():
+    """Hybrid (ML) detection engine, loading the model once per session."""
+    from app.utils.constants import ENV_TRUE_VALUES
+    if os.environ.get("CHATCOMPANION_DISABLE_ML", "").strip().lower() in ENV_TRUE_VALUES:
+        pytest.skip("ML tests disabled via CHATCOMPANION_DISABLE_ML")
+    from app.detection.engine import DetectionEngine
+    return DetectionEngine(use_ml=True)
+
+
+@pytest.fixture(scope="session")
+def batch_results():
+    """Analyze texts in a single engine.analyze_batch call, returning results keyed by text.
+
+    For module-scoped fixtures that share one batch across parametrized tests.
+    """
+    def analyze_texts(engine, texts):
+        texts = list(texts)
+        return dict(zip(texts, engine.analyze_batch(texts)))
+    return analyze_texts
+
+
+@pytest.fixture(scope="session")
+def generator():
+    """Chat corpus generator with the fixed seed used by the corpus tests."""
+    from app.testing.chat_corpus_generator import ChatCorpusGenerator
+    return ChatCorpusGenerator(seed=1337)
+
+
+@pytest.fixture(scope="session")
+def explainer():
+    """Explanation generator, built once and shared across tests."""
+    from app.detection.explainer import ExplanationGenerator
+    return ExplanationGenerator()
+
+
+@pytest.fixture(scope="session")
+def normalizer():
+    """Slang normalizer, built once and shared across tests."""
+    from app.detection.slang_normalizer import SlangNormalizer
+    return SlangNormalizer()
@@ -1,20 +1,17 @@
 """Tests for detection engine."""
 
 import pytest
-from app.detection.engine import DetectionEngine
-from app.utils.constants import RiskLevel
+from app.utils.constants import RiskCategory, RiskLevel
 
 
-def test_detection_engine_initialization():
+def test_detection_engine_initialization(engine):
     """Test that detection engine initializes correctly."""
-    engine = DetectionEngine(use_ml=False)  # Use rules-only for testing
     assert engine is not None
     assert engine.rule_engine is not None
 
 
-def test_rules_only_mode():
+def test_rules_only_mode(engine):
     """Test that rules-only mode works when ML is disabled."""
-    engine = DetectionEngine(use_ml=False)
     text = "You are so stupid. Nobody likes you."
     result = engine.analyze(text)
     
@@ -24,9 +21,8 @@ def test_rules_only_mode():
     assert result.overall_score <= 1.0
 
 
-def test_high_risk_detection():
+def test_high_risk_detection(engine):
     """Test detection of high-risk content."""
-    engine = DetectionEngine(use_ml=False)
     text = "Don't tell anyone. Meet me alone. Delete these messages."
     result = engine.analyze(text)
     
@@ -36,53 +32,45 @@ def test_high_risk_detection():
     assert result.overall_score > 0.5
 
 
-def test_low_risk_detection():
-    """Test detection of low-risk content."""
-    engine = DetectionEngine(use_ml=False)
-    text = "Hey! How was your day? Want to study together?"
-    result = engine.analyze(text)
-    
-    # Should have low risk (GREEN)
-    assert result.risk_level == RiskLevel.GREEN
-    assert result.overall_score < 0.3
-
-
-def test_mild_risk_detection():
-    """Test detection of mild/ambiguous content (should be YELLOW)."""
-    engine = DetectionEngine(use_ml=False)
-    text = "Everyone else is doing it, why can't you? Don't be scared."
-    result = engine.analyze(text)
-    
-    # Should be YELLOW (mild pressure, not severe)
-    assert result.risk_level == RiskLevel.YELLOW
-    assert 0.3 <= result.overall_score < 0.8
-
-
-def test_severe_risk_detection():
-    """Test detection of clearly severe content (should be RED)."""
-    engine = DetectionEngine(use_ml=False)
-    text = "You're so stupid. Nobody likes you. Kill yourself."
-    result = engine.analyze(text)
-    
-    # Should be RED (severe bullying with threats)
-    assert result.risk_level == RiskLevel.RED
-    assert result.overall_score >= 0.8
-
-
-def test_grooming_high_risk():
-    """Test detection of grooming patterns (should be RED)."""
-    engine = DetectionEngine(use_ml=False)
-    text = "You're so mature for your age. Meet me alone without telling anyone. Don't tell your parents."
-    result = engine.analyze(text)
+# (text, expected level, minimum score, upper score bound (exclusive))
+RISK_LEVEL_CASES = [
+    # Low risk: friendly chat
+    ("Hey! How was your day? Want to study together?", RiskLevel.GREEN, 0.0, 0.3),
+    # Mild pressure, not severe
+    ("Everyone else is doing it, why can't you? Don't be scared.", RiskLevel.YELLOW, 0.3, 0.8),
+    # Severe bullying with threats
+    ("You're so stupid. Nobody likes you. Kill yourself.", RiskLevel.RED, 0.8, float("inf")),
+    # Multiple severe grooming patterns
+    (
+        "You're so mature for your age. Meet me alone without telling anyone. Don't tell your parents.",
+        RiskLevel.RED,
+        0.8,
+        float("inf"),
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def risk_level_results(engine, batch_results):
+    """Analyze all RISK_LEVEL_CASES texts in a single batch."""
+    return batch_results(engine, (text for text, _, _, _ in RISK_LEVEL_CASES))
+
+
+@pytest.mark.parametrize(
+    "text,level,min_score,max_score",
+    RISK_LEVEL_CASES,
+    ids=["low_risk", "mild_risk", "severe_risk", "grooming_high_risk"],
+)
+def test_risk_level_detection(risk_level_results, text, level, min_score, max_score):
+    """Test that clear GREEN/YELLOW/RED examples get the expected level and score range."""
+    result = risk_level_results[text]
     
-    # Should be RED (multiple severe grooming patterns)
-    assert result.risk_level == RiskLevel.RED
-    assert result.overall_score >= 0.8
+    assert result.risk_level == level
+    assert min_score <= result.overall_score < max_score
 
 
-def test_professional_conversation_low_risk():
+def test_professional_conversation_low_risk(engine):
     """Test that professional/workplace conversations get appropriate guidance."""
-    engine = DetectionEngine(use_ml=False)
     text = "Alex: Hey Sam, I need to talk about the bug fix. Sam: Sure, what's the issue? Alex: The code broke production. Sam: I'm so sorry! I'll fix it immediately."
     result = engine.analyze(text)
     
@@ -91,16 +79,15 @@ def test_professional_conversation_low_risk():
     assert result.overall_score < 0.8
     
     # Guidance should NOT mention "trusted adult" for professional context
-    assert "trusted adult" not in result.explanation.lower() or result.risk_level == RiskLevel.RED
+    assert "trusted adult" not in result.explanation_lower or result.risk_level == RiskLevel.RED
     # Advice should be context-appropriate
     advice_text = " ".join(result.advice).lower()
     if result.risk_level != RiskLevel.RED:
         assert "trusted adult" not in advice_text
 
 
-def test_guidance_by_risk_level():
+def test_guidance_by_risk_level(engine):
     """Test that guidance messages match risk levels appropriately."""
-    engine = DetectionEngine(use_ml=False)
     
     # Low risk - should get neutral guidance
     low_risk_text = "Hey! How was your day? Want to study together?"
@@ -114,15 +101,14 @@ def test_guidance_by_risk_level():
     assert high_result.risk_level == RiskLevel.RED
     # RED should mention trusted person or support service
     advice_text = " ".join(high_result.advice).lower()
-    explanation_text = high_result.explanation.lower()
+    explanation_text = high_result.explanation_lower
     assert ("trusted person" in advice_text or "trusted person" in explanation_text or 
             "trusted adult" in advice_text or "trusted adult" in explanation_text or
             "support service" in advice_text or "support service" in explanation_text)
 
 
-def test_explanation_generation():
+def test_explanation_generation(engine):
     """Test that explanations are generated."""
-    engine = DetectionEngine(use_ml=False)
     text = "You are so stupid."
     result = engine.analyze(text)
     
@@ -130,12 +116,90 @@ def test_explanation_generation():
     assert len(result.explanation) > 0
 
 
-def test_advice_generation():
+def test_advice_generation(engine):
     """Test that advice is provided."""
-    engine = DetectionEngine(use_ml=False)
     text = "Test text"
     result = engine.analyze(text)
     
     assert result.advice is not None
     assert len(result.advice) > 0
 
+
+
+def test_analyze_batch_matches_analyze(engine):
+    """Test that batch analysis returns the same results as per-text analysis."""
+    texts = [
+        "Hey, want to play a game later?",
+        "Don't tell anyone. Meet me alone. Delete these messages.",
+        "You are so stupid. Nobody likes you.",
+    ]
+    
+    batch_results = engine.analyze_batch(texts)
+    
+    assert len(batch_results) == len(texts)
+    for text, batch_result in zip(texts, batch_results):
+        single_result = engine.analyze(text)
+        assert batch_result.risk_level == single_result.risk_level
+        assert batch_result.category_scores == single_result.category_scores
+        assert batch_result.explanation == single_result.explanation
+    
+    assert engine.analyze_batch([]) == []
+
+
+class _StubClassifier:
+    """Classifier with deterministic per-sentence scores that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def classify_batch(self, sentences):
+        self.calls += 1
+        return [
+            {category.value: (len(sentence) * (i + 1) % 10) / 10 for i, category in enumerate(RiskCategory)}
+            for sentence in sentences
+        ]
+
+
+def test_analyze_batch_ml_scores_match_analyze(monkeypatch):
+    """Test that batch analysis splits one classifier batch back into per-text ML scores."""
+    from app.detection.engine import DetectionEngine
+    
+    # Fresh engine: the shared rules-only fixture must not be switched to hybrid mode
+    hybrid_engine = DetectionEngine(use_ml=False)
+    hybrid_engine.classifier = _StubClassifier()
+    hybrid_engine.ml_available = True
+    
+    # Record the ML scores each result is built from
+    ml_scores_seen = []
+    build_result = hybrid_engine._build_result
+    
+    def recording_build_result(text, rules_state, ml_scores):
+        ml_scores_seen.append(ml_scores)
+        return build_result(text, rules_state, ml_scores)
+    
+    monkeypatch.setattr(hybrid_engine, "_build_result", recording_build_result)
+    
+    # Zero-sentence texts at the start, middle and end shift the score offsets
+    texts = [
+        "",
+        "Hey, want to play a game later? Sure!",
+        "   ",
+        "Don't tell anyone. Meet me alone. Delete these messages.",
+        "ok",
+        "",
+    ]
+    
+    batch_results = hybrid_engine.analyze_batch(texts)
+    batch_ml_scores = list(ml_scores_seen)
+    assert hybrid_engine.classifier.calls == 1
+    
+    ml_scores_seen.clear()
+    single_results = [hybrid_engine.analyze(text) for text in texts]
+    
+    assert batch_ml_scores == ml_scores_seen
+    assert batch_ml_scores[0] == {} and batch_ml_scores[2] == {}
+    assert batch_ml_scores[1] and batch_ml_scores[3]
+    for batch_result, single_result in zip(batch_results, single_results):
+        assert batch_result.ml_available
+        assert batch_result.risk_level == single_result.risk_level
+        assert batch_result.overall_score == single_result.overall_score
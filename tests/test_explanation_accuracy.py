@@ -14,8 +14,9 @@
 
 """Tests for explanation accuracy (GREEN/YELLOW/RED messaging)."""
 
+import re
+
 import pytest
-from app.detection.engine import DetectionEngine
 from app.utils.constants import RiskLevel
 from tests.test_chat_fixtures_youth import (
     green_youth_friendly,
@@ -23,66 +24,94 @@ from tests.test_chat_fixtures_youth import (
     red_coercive_control_slang,
 )
 
+# Detection engine integration tests; keep them on one xdist worker under --dist=loadgroup
+pytestmark = [pytest.mark.slow, pytest.mark.xdist_group(name="detection_engine")]
+
+# Accepted risk levels for asserts that allow either of two outcomes
+NON_GREEN = frozenset({RiskLevel.YELLOW, RiskLevel.RED})
+GREEN_OR_YELLOW = frozenset({RiskLevel.GREEN, RiskLevel.YELLOW})
+
+# Threat wording probes, compiled once: one scan instead of an `in` per word
+THREAT_LANGUAGE_RE = re.compile(r"threats?|consequences?", re.IGNORECASE)
+THREAT_IN_OBSERVED_RE = re.compile(r"threats?|consequences?|withdrawal", re.IGNORECASE)
+# Splits an explanation at its Observed behaviors heading, in any case
+OBSERVED_BEHAVIORS_RE = re.compile(r"observed behaviors", re.IGNORECASE)
+
+# Texts shared by several tests, so the memoized analyze runs them once
+GREEN_NO_PRESSURE = "I'm busy right now, can we talk later? no pressure"
+# Coercive control with secrecy + isolation
+RED_COERCIVE_CONTROL = (
+    "Person: Delete those messages and prove it\n"
+    "You: Why?\n"
+    "Person: Don't talk to other people about this\n"
+    "You: But...\n"
+    "Person: If you tell anyone, we're done"
+)
+
+
+GREEN_CASES = [
+    GREEN_NO_PRESSURE,
+    "Hey, how are you?",
+    "Friend: Want to hang out?\nYou: Maybe later\nFriend: No worries, take your time",
+    green_youth_friendly,
+]
 
-def test_green_never_mentions_mild_patterns():
+
+@pytest.fixture(scope="module")
+def green_results(engine, batch_results):
+    """Analyze all GREEN_CASES texts in a single batch."""
+    return batch_results(engine, GREEN_CASES)
+
+
+@pytest.mark.parametrize("text", GREEN_CASES, ids=["busy", "hello", "hangout", "youth_friendly"])
+def test_green_never_mentions_mild_patterns(green_results, text):
     """Test that GREEN explanations never mention 'mild patterns'."""
-    engine = DetectionEngine(use_ml=False)
-    
-    test_cases = [
-        "I'm busy right now, can we talk later? no pressure",
-        "Hey, how are you?",
-        "Friend: Want to hang out?\nYou: Maybe later\nFriend: No worries, take your time",
-    ]
-    
-    for text in test_cases:
-        result = engine.analyze(text)
-        if result.risk_level == RiskLevel.GREEN:
-            explanation_lower = result.explanation.lower()
-            assert "mild patterns" not in explanation_lower, (
-                f"GREEN explanation should not mention 'mild patterns'. "
-                f"Explanation: {result.explanation}"
-            )
-            assert "some patterns" not in explanation_lower or "patterns noted" not in explanation_lower, (
-                f"GREEN explanation should not mention patterns. "
-                f"Explanation: {result.explanation}"
-            )
+    result = green_results[text]
+    if result.risk_level == RiskLevel.GREEN:
+        explanation_lower = result.explanation_lower
+        assert "mild patterns" not in explanation_lower, (
+            f"GREEN explanation should not mention 'mild patterns'. "
+            f"Explanation: {result.explanation}"
+        )
+        assert "some patterns" not in explanation_lower or "patterns noted" not in explanation_lower, (
+            f"GREEN explanation should not mention patterns. "
+            f"Explanation: {result.explanation}"
+        )
 
 
-def test_yellow_mentions_guilt_shifting_when_present():
+def test_yellow_mentions_guilt_shifting_when_present(analyze):
     """Test that YELLOW explanations mention guilt-shifting when present."""
-    engine = DetectionEngine(use_ml=False)
     
     text = "If you cared about me, you would have answered sooner. I'm the only one trying here."
     
-    result = engine.analyze(text)
+    result = analyze(text)
     
     assert result.risk_level == RiskLevel.YELLOW, (
         f"Expected YELLOW for guilt-shifting, got {result.risk_level}"
     )
-    explanation_lower = result.explanation.lower()
+    explanation_lower = result.explanation_lower
     assert "guilt" in explanation_lower, (
         f"YELLOW explanation should mention guilt-shifting when present. "
         f"Explanation: {result.explanation}"
     )
 
 
-def test_yellow_no_threats_unless_present():
+def test_yellow_no_threats_unless_present(analyze):
     """Test that YELLOW explanations don't mention threats unless actually present."""
-    engine = DetectionEngine(use_ml=False)
     
     # Pressure without threats
     text = "Answer faster please. I feel ignored."
     
-    result = engine.analyze(text)
+    result = analyze(text)
     
     if result.risk_level == RiskLevel.YELLOW:
-        explanation_lower = result.explanation.lower()
+        explanation_lower = result.explanation_lower
         # Check if threat patterns are actually detected
         has_threat_patterns = any(
-            "ultimatum" in m.pattern.description.lower() or
-            "threat" in m.pattern.description.lower() or
-            "relationship threat" in m.pattern.description.lower()
-            for m in result.matches.get("pressure", [])
+            "ultimatum" in description or
+            "threat" in description or
+            "relationship threat" in description
+            for description in (m.pattern.description.lower() for m in result.matches.get("pressure", ()))
         )
         
         if not has_threat_patterns:
@@ -93,20 +122,10 @@ def test_yellow_no_threats_unless_present():
             )
 
 
-def test_red_shows_need_immediate_help():
+def test_red_shows_need_immediate_help(analyze):
     """Test that RED risk level shows 'Need Immediate Help?' section."""
-    engine = DetectionEngine(use_ml=False)
     
-    # Coercive control with secrecy + isolation
-    text = """
-    Person: Delete those messages and prove it
-    You: Why?
-    Person: Don't talk to other people about this
-    You: But...
-    Person: If you tell anyone, we're done
-    """
-    
-    result = engine.analyze(text)
+    result = analyze(RED_COERCIVE_CONTROL)
     
     assert result.risk_level == RiskLevel.RED, (
         f"Expected RED for coercive control, got {result.risk_level}. "
@@ -118,19 +137,16 @@ def test_red_shows_need_immediate_help():
     )
     
     # Verify pattern counts are realistic
-    total_matches = sum(len(matches) for matches in result.matches.values())
+    total_matches = result.total_match_count
     assert total_matches > 1, (
         f"Expected multiple pattern matches for RED case, got {total_matches}"
     )
 
 
-def test_green_no_warning_box():
+def test_green_no_warning_box(analyze):
     """Test that GREEN risk level doesn't show warning box."""
-    engine = DetectionEngine(use_ml=False)
-    
-    text = "I'm busy right now, can we talk later? no pressure"
     
-    result = engine.analyze(text)
+    result = analyze(GREEN_NO_PRESSURE)
     
     assert result.risk_level == RiskLevel.GREEN, (
         f"Expected GREEN, got {result.risk_level}"
@@ -142,17 +158,16 @@ def test_green_no_warning_box():
     )
 
 
-def test_yellow_no_need_immediate_help():
+def test_yellow_no_need_immediate_help(analyze):
     """Test that YELLOW does NOT show 'Need Immediate Help?'."""
-    engine = DetectionEngine(use_ml=False)
     
     # Use a milder guilt-shifting phrase that should be YELLOW
     text = "I wish you would respond more often."
     
-    result = engine.analyze(text)
+    result = analyze(text)
     
     # Should be GREEN or YELLOW (not RED)
-    assert result.risk_level in [RiskLevel.GREEN, RiskLevel.YELLOW], (
+    assert result.risk_level in GREEN_OR_YELLOW, (
         f"Expected GREEN or YELLOW for mild pressure, got {result.risk_level}"
     )
     # YELLOW should NOT trigger "Need Immediate Help?" (that's RED only)
@@ -162,16 +177,15 @@ def test_yellow_no_need_immediate_help():
         )
 
 
-def test_green_youth_friendly_fixture():
+def test_green_youth_friendly_fixture(green_results):
     """Test GREEN youth-friendly fixture: no 'mild patterns', no trigger word quotes."""
-    engine = DetectionEngine(use_ml=False)
     
-    result = engine.analyze(green_youth_friendly)
+    result = green_results[green_youth_friendly]
     
     assert result.risk_level == RiskLevel.GREEN, (
         f"Expected GREEN for youth-friendly banter, got {result.risk_level}"
     )
-    explanation_lower = result.explanation.lower()
+    explanation_lower = result.explanation_lower
     assert "mild patterns" not in explanation_lower, (
         "GREEN explanation should not mention 'mild patterns'"
     )
@@ -181,18 +195,17 @@ def test_green_youth_friendly_fixture():
     )
 
 
-def test_yellow_pressure_guilt_no_threats():
+def test_yellow_pressure_guilt_no_threats(analyze):
     """Test YELLOW pressure+guilt without ultimatum -> explanation MUST NOT contain: threat, consequence, withdrawal."""
-    engine = DetectionEngine(use_ml=False)
     
     text = "if you cared you would answer faster. i'm the only one trying"
     
-    result = engine.analyze(text)
+    result = analyze(text)
     
-    assert result.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
+    assert result.risk_level in NON_GREEN, (
         f"Expected YELLOW or RED for pressure+guilt, got {result.risk_level}"
     )
-    explanation_lower = result.explanation.lower()
+    explanation_lower = result.explanation_lower
     
     # Must NOT contain threat language when no ultimatums are present
     assert "threat" not in explanation_lower or "threats" not in explanation_lower, (
@@ -211,130 +224,91 @@ def test_yellow_pressure_guilt_no_threats():
     )
 
 
-def test_yellow_with_explicit_ultimatum():
+def test_yellow_with_explicit_ultimatum(analyze):
     """Test YELLOW/RED with explicit ultimatum -> explanation MUST contain threats or consequences."""
-    engine = DetectionEngine(use_ml=False)
     
     text = "answer me right now or we're done"
     
-    result = engine.analyze(text)
+    result = analyze(text)
     
-    assert result.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
+    assert result.risk_level in NON_GREEN, (
         f"Expected YELLOW or RED for explicit ultimatum, got {result.risk_level}"
     )
-    explanation_lower = result.explanation.lower()
     
     # Must contain threat language when ultimatums are present
-    has_threat_language = (
-        "threat" in explanation_lower or 
-        "threats" in explanation_lower or
-        "consequence" in explanation_lower or
-        "consequences" in explanation_lower
-    )
+    has_threat_language = bool(THREAT_LANGUAGE_RE.search(result.explanation))
     assert has_threat_language, (
         f"YELLOW/RED explanation should mention 'threats' or 'consequences' when ultimatums present. Explanation: {result.explanation}"
     )
 
 
-def test_red_with_relationship_threat():
+def test_red_with_relationship_threat(analyze):
     """Test RED with relationship threat -> mentions threats, listed in Observed behaviors."""
-    engine = DetectionEngine(use_ml=False)
     
     text = "if you don't delete those messages, we're done"
     
-    result = engine.analyze(text)
+    result = analyze(text)
     
     assert result.risk_level == RiskLevel.RED, (
         f"Expected RED for relationship threat, got {result.risk_level}"
     )
-    explanation_lower = result.explanation.lower()
     
     # Must mention threats
-    has_threat_language = (
-        "threat" in explanation_lower or 
-        "threats" in explanation_lower or
-        "consequence" in explanation_lower or
-        "consequences" in explanation_lower
-    )
+    has_threat_language = bool(THREAT_LANGUAGE_RE.search(result.explanation))
     assert has_threat_language, (
         f"RED explanation should mention threats. Explanation: {result.explanation}"
     )
     
     # Must be listed in Observed behaviors
-    assert "Observed behaviors" in result.explanation or "observed behaviors" in explanation_lower, (
+    obs_parts = OBSERVED_BEHAVIORS_RE.split(result.explanation)
+    assert len(obs_parts) > 1, (
         f"RED explanation should include Observed behaviors section. Explanation: {result.explanation}"
     )
     # Check that threats are mentioned in Observed behaviors
-    if "Observed behaviors" in result.explanation or "observed behaviors" in explanation_lower:
-        # Extract Observed behaviors section
-        obs_section = result.explanation.split("Observed behaviors")[-1] if "Observed behaviors" in result.explanation else result.explanation.split("observed behaviors")[-1]
-        obs_lower = obs_section.lower()
-        has_threat_in_obs = (
-            "threat" in obs_lower or 
-            "threats" in obs_lower or
-            "consequence" in obs_lower or
-            "consequences" in obs_lower or
-            "withdrawal" in obs_lower
-        )
-        assert has_threat_in_obs, (
-            f"Observed behaviors should mention threats. Observed behaviors section: {obs_section}"
-        )
+    obs_section = obs_parts[-1]
+    has_threat_in_obs = bool(THREAT_IN_OBSERVED_RE.search(obs_section))
+    assert has_threat_in_obs, (
+        f"Observed behaviors should mention threats. Observed behaviors section: {obs_section}"
+    )
 
 
-def test_observed_behaviors_evidence_based():
+@pytest.mark.parametrize("text,expected_categories", [
+    ("if you cared you would answer faster", ["guilt_shifting"]),
+    ("answer me right now or we're done", ["pressure"]),
+    ("delete those messages and send a screenshot", ["secrecy", "manipulation"]),
+    ("you're so stupid", ["bullying"]),
+])
+def test_observed_behaviors_evidence_based(analyze, explainer, text, expected_categories):
     """Test that Observed behaviors are strictly evidence-based (derived from matched patterns only)."""
-    engine = DetectionEngine(use_ml=False)
     
-    test_cases = [
-        ("if you cared you would answer faster", ["guilt_shifting"]),
-        ("answer me right now or we're done", ["pressure"]),
-        ("delete those messages and send a screenshot", ["secrecy", "manipulation"]),
-        ("you're so stupid", ["bullying"]),
-    ]
+    result = analyze(text)
     
-    for text, expected_categories in test_cases:
-        result = engine.analyze(text)
-        
-        # Extract Observed behaviors section
-        explanation_lower = result.explanation.lower()
-        if "observed behaviors" in explanation_lower:
-            obs_section = result.explanation.split("Observed behaviors")[-1] if "Observed behaviors" in result.explanation else result.explanation.split("observed behaviors")[-1]
-            
-            # Verify that behaviors mentioned are supported by matched patterns
-            matched_categories = set(result.matches.keys())
-            matched_categories = {cat for cat in matched_categories if len(result.matches[cat]) > 0}
-            
-            # Check that threat language only appears if threat patterns are matched
-            obs_lower = obs_section.lower()
-            has_threat_in_obs = (
-                "threat" in obs_lower or 
-                "threats" in obs_lower or
-                "consequence" in obs_lower or
-                "consequences" in obs_lower or
-                "withdrawal" in obs_lower
+    # Extract Observed behaviors section
+    obs_parts = OBSERVED_BEHAVIORS_RE.split(result.explanation)
+    if len(obs_parts) > 1:
+        obs_section = obs_parts[-1]
+    
+        # Check that threat language only appears if threat patterns are matched
+        has_threat_in_obs = bool(THREAT_IN_OBSERVED_RE.search(obs_section))
+    
+        if has_threat_in_obs:
+            # Verify that threat patterns are actually matched
+            has_threat_patterns = explainer._has_threat_patterns(result.matches)
+            assert has_threat_patterns, (
+                f"Observed behaviors mention threats but no threat patterns matched. "
+                f"Text: {text}, Observed behaviors: {obs_section}, Matches: {result.matches}"
             )
-            
-            if has_threat_in_obs:
-                # Verify that threat patterns are actually matched
-                from app.detection.explainer import ExplanationGenerator
-                explainer = ExplanationGenerator()
-                has_threat_patterns = explainer._has_threat_patterns(result.matches)
-                assert has_threat_patterns, (
-                    f"Observed behaviors mention threats but no threat patterns matched. "
-                    f"Text: {text}, Observed behaviors: {obs_section}, Matches: {result.matches}"
-                )
-
-
-def test_yellow_guilt_slang_fixture():
+
+
+def test_yellow_guilt_slang_fixture(analyze):
     """Test YELLOW guilt-slang fixture: must mention guilt-shifting."""
-    engine = DetectionEngine(use_ml=False)
     
-    result = engine.analyze(yellow_guilt_slang)
+    result = analyze(yellow_guilt_slang)
     
-    assert result.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
+    assert result.risk_level in NON_GREEN, (
         f"Expected YELLOW or RED for guilt-shifting, got {result.risk_level}"
     )
-    explanation_lower = result.explanation.lower()
+    explanation_lower = result.explanation_lower
     assert "guilt" in explanation_lower, (
         "YELLOW explanation should mention guilt-shifting when present"
     )
@@ -345,11 +319,10 @@ def test_yellow_guilt_slang_fixture():
         )
 
 
-def test_red_coercive_control_slang_fixture():
+def test_red_coercive_control_slang_fixture(analyze):
     """Test RED coercive control fixture: 'Need Immediate Help?' appears exactly once."""
-    engine = DetectionEngine(use_ml=False)
     
-    result = engine.analyze(red_coercive_control_slang)
+    result = analyze(red_coercive_control_slang)
     
     assert result.risk_level == RiskLevel.RED, (
         f"Expected RED for coercive control, got {result.risk_level}"
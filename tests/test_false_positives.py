@@ -15,13 +15,17 @@
 """Tests for false positive reduction, especially friendly teasing."""
 
 import pytest
-from app.detection.engine import DetectionEngine
 from app.utils.constants import RiskLevel
 
+# Detection engine integration tests; keep them on one xdist worker under --dist=loadgroup
+pytestmark = [pytest.mark.slow, pytest.mark.xdist_group(name="detection_engine")]
 
-def test_friendly_teasing_with_joking_markers():
+# Accepted risk levels for asserts that allow either of two outcomes
+NON_GREEN = frozenset({RiskLevel.YELLOW, RiskLevel.RED})
+
+
+def test_friendly_teasing_with_joking_markers(engine):
     """Test that friendly teasing with joking markers is classified as GREEN."""
-    engine = DetectionEngine(use_ml=False)  # Use rules-only for consistent testing
     
     # Friendly teasing with joking markers
     text = """
@@ -44,9 +48,8 @@ def test_friendly_teasing_with_joking_markers():
     )
 
 
-def test_friendly_teasing_mutual():
+def test_friendly_teasing_mutual(engine):
     """Test that mutual teasing between friends is classified as GREEN."""
-    engine = DetectionEngine(use_ml=False)
     
     # Mutual teasing - both sides tease
     text = """
@@ -63,9 +66,8 @@ def test_friendly_teasing_mutual():
     )
 
 
-def test_friendly_teasing_positive_ending():
+def test_friendly_teasing_positive_ending(engine):
     """Test that teasing with positive endings is classified as GREEN."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Friend: You're being ridiculous
@@ -81,9 +83,8 @@ def test_friendly_teasing_positive_ending():
     )
 
 
-def test_realistic_bullying_one_sided():
+def test_realistic_bullying_one_sided(engine):
     """Test that one-sided bullying without joking markers is classified as YELLOW or RED."""
-    engine = DetectionEngine(use_ml=False)
     
     # One-sided bullying - no joking markers, negative tone
     text = """
@@ -99,7 +100,7 @@ def test_realistic_bullying_one_sided():
     result = engine.analyze(text)
     
     # Should be YELLOW or RED (not GREEN)
-    assert result.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
+    assert result.risk_level in NON_GREEN, (
         f"Expected YELLOW or RED for one-sided bullying, got {result.risk_level}"
     )
     assert result.category_scores.get("bullying", 0.0) > 0.3, (
@@ -107,9 +108,8 @@ def test_realistic_bullying_one_sided():
     )
 
 
-def test_realistic_bullying_severe_insults():
+def test_realistic_bullying_severe_insults(engine):
     """Test that severe insults without joking markers are classified as RED."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Jordan: You're a waste of space
@@ -125,9 +125,8 @@ def test_realistic_bullying_severe_insults():
     )
 
 
-def test_realistic_bullying_no_joking_markers():
+def test_realistic_bullying_no_joking_markers(engine):
     """Test that insults without joking markers are classified as risky."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Person: You're pathetic
@@ -143,9 +142,8 @@ def test_realistic_bullying_no_joking_markers():
     )
 
 
-def test_acceptance_criteria_green_chat():
+def test_acceptance_criteria_green_chat(engine):
     """Test acceptance criteria: GREEN chat with 'no pressure' should be GREEN."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Friend: Hey, want to hang out later?
@@ -160,14 +158,13 @@ def test_acceptance_criteria_green_chat():
     assert result.risk_level == RiskLevel.GREEN, (
         f"Expected GREEN for 'no pressure' chat, got {result.risk_level}"
     )
-    assert "no pressure" in result.explanation.lower() or result.overall_score < 0.3, (
+    assert "no pressure" in result.explanation_lower or result.overall_score < 0.3, (
         "Should detect no pressure or have low overall score"
     )
 
 
-def test_acceptance_criteria_yellow_guilt_shifting():
+def test_acceptance_criteria_yellow_guilt_shifting(engine):
     """Test acceptance criteria: YELLOW chat with guilt-shifting should mention it."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Person: If you cared about me, you would have answered sooner
@@ -181,14 +178,13 @@ def test_acceptance_criteria_yellow_guilt_shifting():
     assert result.risk_level == RiskLevel.YELLOW, (
         f"Expected YELLOW for guilt-shifting, got {result.risk_level}"
     )
-    assert "guilt" in result.explanation.lower() or result.category_scores.get("guilt_shifting", 0.0) > 0.2, (
+    assert "guilt" in result.explanation_lower or result.category_scores.get("guilt_shifting", 0.0) > 0.2, (
         "Should mention guilt-shifting or have guilt_shifting score > 0.2"
     )
 
 
-def test_acceptance_criteria_red_coercive_control():
+def test_acceptance_criteria_red_coercive_control(engine):
     """Test acceptance criteria: RED chat with coercive control should be RED."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Person: Delete those messages and prove it
@@ -203,19 +199,18 @@ def test_acceptance_criteria_red_coercive_control():
     assert result.risk_level == RiskLevel.RED, (
         f"Expected RED for coercive control, got {result.risk_level}"
     )
-    assert "secrecy" in result.explanation.lower() or "isolation" in result.explanation.lower(), (
+    assert "secrecy" in result.explanation_lower or "isolation" in result.explanation_lower, (
         "Should mention secrecy or isolation in explanation"
     )
     # Should have multiple pattern matches
-    total_matches = sum(len(matches) for matches in result.matches.values())
+    total_matches = result.total_match_count
     assert total_matches > 1, (
         f"Expected multiple pattern matches for RED case, got {total_matches}"
     )
 
 
-def test_youth_friendly_banter_slang():
+def test_youth_friendly_banter_slang(engine):
     """Test that youth-friendly banter with slang abbreviations is classified as GREEN."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     Friend: ur being so ridiculous rn lol
@@ -236,9 +231,8 @@ def test_youth_friendly_banter_slang():
     )
 
 
-def test_slang_banter_with_mutuality_and_repair():
+def test_slang_banter_with_mutuality_and_repair(engine):
     """Test that slang banter with mutuality and repair markers is GREEN."""
-    engine = DetectionEngine(use_ml=False)
     
     text = """
     A: bruh ur wild frfr 😂
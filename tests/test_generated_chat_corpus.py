@@ -4,56 +4,83 @@ Verifies that the detection pipeline correctly handles synthetic chats
 with youth slang and obfuscation variants.
 """
 
+import re
+
 import pytest
 
-from app.detection.engine import DetectionEngine
-from app.testing.chat_corpus_generator import ChatCorpusGenerator
+from app.testing.chat_corpus_generator import RISK_LEVELS, ChatCorpusGenerator, generate_level
 from app.utils.constants import RiskLevel
 
 
-class TestGeneratedChatCorpus:
-    """Test generated chat corpus against detection pipeline."""
+def _generate_chats(level: str, count: int = 30) -> list:
+    """Generate chats for one level from a fresh fixed-seed generator."""
+    generator = ChatCorpusGenerator(seed=1337)
+    generate_chat = getattr(generator, f"generate_{level}_chat")
+    return [generate_chat(f"{level}_{i}") for i in range(count)]
+
+
+# Generated once at import so each chat can be its own (xdist-distributable) test case
+GREEN_CHATS = _generate_chats("green")
+YELLOW_CHATS = _generate_chats("yellow")
+RED_CHATS = _generate_chats("red")
+
+# Explanation keyword probes, compiled once: one scan per check instead of an `in` per word
+THREAT_RE = re.compile(r"threat|consequence|withdrawal", re.IGNORECASE)
+SECRECY_RE = re.compile(r"secre(?:t|cy)|private", re.IGNORECASE)
+CONTROL_RE = re.compile(r"control|pressure", re.IGNORECASE)
+
+
+@pytest.fixture(scope="module")
+def green_results(detection_engine, batch_results):
+    """Hybrid results for GREEN_CHATS, one classifier batch for the whole level."""
+    return batch_results(detection_engine, (chat["chat_text"] for chat in GREEN_CHATS))
+
+
+@pytest.fixture(scope="module")
+def yellow_results(detection_engine, batch_results):
+    """Hybrid results for YELLOW_CHATS, one classifier batch for the whole level."""
+    return batch_results(detection_engine, (chat["chat_text"] for chat in YELLOW_CHATS))
+
+
+@pytest.fixture(scope="module")
+def red_results(detection_engine, batch_results):
+    """Hybrid results for RED_CHATS, one classifier batch for the whole level."""
+    return batch_results(detection_engine, (chat["chat_text"] for chat in RED_CHATS))
 
-    @pytest.fixture
-    def detection_engine(self):
-        """Create detection engine instance."""
-        return DetectionEngine(use_ml=True)
 
-    @pytest.fixture
-    def generator(self):
-        """Create chat generator with fixed seed."""
-        return ChatCorpusGenerator(seed=1337)
+class TestGeneratedChatCorpus:
+    """Test generated chat corpus against detection pipeline."""
 
-    def test_green_chats(self, detection_engine, generator):
+    @pytest.mark.parametrize("chat", GREEN_CHATS, ids=lambda chat: chat["id"])
+    def test_green_chats(self, green_results, chat):
         """Test GREEN chats: should be classified as green with no warnings."""
-        green_chats = [generator.generate_green_chat(f"green_{i}") for i in range(30)]
+        result = green_results[chat["chat_text"]]
         
-        green_count = 0
-        for chat in green_chats:
-            result = detection_engine.analyze(chat["chat_text"])
+        # Not every chat is GREEN (some YELLOW due to pattern matching edge cases);
+        # behavior is verified for the ones that are
+        if result.risk_level == RiskLevel.GREEN:
+            explanation_lower = result.explanation_lower
             
-            # Most should be GREEN (allow some YELLOW due to pattern matching edge cases)
-            if result.risk_level == RiskLevel.GREEN:
-                green_count += 1
-                
-                # For chats actually classified as GREEN, verify correct behavior
-                explanation_lower = result.explanation.lower()
-                
-                # Assert explanation contains "No warning signs" or equivalent
-                assert "warning sign" in explanation_lower or "didn't see" in explanation_lower, (
-                    f"Chat {chat['id']} (GREEN) should mention no warning signs"
-                )
-                
-                # Assert no "Observed behaviors" (GREEN should not list behaviors)
-                assert "observed behavior" not in explanation_lower, (
-                    f"Chat {chat['id']} (GREEN) should not list observed behaviors"
-                )
-                
-                # Assert pattern matches are empty for GREEN
-                total_matches = sum(len(matches) for matches in result.matches.values())
-                assert total_matches == 0, (
-                    f"Chat {chat['id']} (GREEN) should have no pattern matches, got {total_matches}"
-                )
+            # Assert explanation contains "No warning signs" or equivalent
+            assert "warning sign" in explanation_lower or "didn't see" in explanation_lower, (
+                f"Chat {chat['id']} (GREEN) should mention no warning signs"
+            )
+            
+            # Assert no "Observed behaviors" (GREEN should not list behaviors)
+            assert "observed behavior" not in explanation_lower, (
+                f"Chat {chat['id']} (GREEN) should not list observed behaviors"
+            )
+            
+            # Assert pattern matches are empty for GREEN (the count is only built on failure)
+            assert not any(result.matches.values()), (
+                f"Chat {chat['id']} (GREEN) should have no pattern matches, got {result.total_match_count}"
+            )
+
+    def test_green_chats_classification_rate(self, green_results):
+        """Test that most generated GREEN chats are classified as GREEN."""
+        green_count = sum(
+            green_results[chat["chat_text"]].risk_level == RiskLevel.GREEN for chat in GREEN_CHATS
+        )
         
         # Assert that at least 80% of generated GREEN chats are actually classified as GREEN
         # (allows for some edge cases where patterns might match)
@@ -61,120 +88,93 @@ class TestGeneratedChatCorpus:
             f"At least 80% of GREEN chats should be classified as GREEN, got {green_count}/30"
         )
 
-    def test_yellow_chats(self, detection_engine, generator):
+    @pytest.mark.parametrize("chat", YELLOW_CHATS, ids=lambda chat: chat["id"])
+    def test_yellow_chats(self, yellow_results, chat):
         """Test YELLOW chats: should be classified as yellow without 'Need Immediate Help?'."""
-        yellow_chats = [generator.generate_yellow_chat(f"yellow_{i}") for i in range(30)]
+        result = yellow_results[chat["chat_text"]]
         
-        yellow_count = 0
-        for chat in yellow_chats:
-            result = detection_engine.analyze(chat["chat_text"])
-            
-            # Most should be YELLOW (allow some GREEN/RED due to pattern matching)
-            if result.risk_level == RiskLevel.YELLOW:
-                yellow_count += 1
+        # Not every chat is YELLOW (some GREEN/RED due to pattern matching);
+        # behavior is verified for the ones that are
+        if result.risk_level == RiskLevel.YELLOW:
+            # For chats actually classified as YELLOW, verify correct behavior
+            # Check threat-gating: threats should only be mentioned if threat patterns matched
+            has_threat_mention = bool(THREAT_RE.search(result.explanation))
             
-                # For chats actually classified as YELLOW, verify correct behavior
-                explanation_lower = result.explanation.lower()
-                
-                # Check threat-gating: threats should only be mentioned if threat patterns matched
-                has_threat_mention = (
-                    "threat" in explanation_lower or
-                    "consequence" in explanation_lower or
-                    "withdrawal" in explanation_lower
+            if has_threat_mention:
+                # If threats are mentioned, verify threat patterns actually matched
+                has_threat_patterns = any(
+                    "threat" in description or "ultimatum" in description
+                    for description in (
+                        match.pattern.description.lower()
+                        for matches in result.matches.values()
+                        for match in matches
+                    )
                 )
                 
-                if has_threat_mention:
-                    # If threats are mentioned, verify threat patterns actually matched
-                    has_threat_patterns = False
-                    for category, matches in result.matches.items():
-                        for match in matches:
-                            pattern_desc = match.pattern.description.lower()
-                            if "threat" in pattern_desc or "ultimatum" in pattern_desc:
-                                has_threat_patterns = True
-                                break
-                        if has_threat_patterns:
-                            break
-                    
-                    assert has_threat_patterns, (
-                        f"Chat {chat['id']} (YELLOW) mentions threats but no threat patterns matched"
+                assert has_threat_patterns, (
+                    f"Chat {chat['id']} (YELLOW) mentions threats but no threat patterns matched"
+                )
+            
+            # Verify pattern match counts: if category is detected, instances > 0
+            for category, matches in result.matches.items():
+                if matches:
+                    assert len(matches) > 0, (
+                        f"Chat {chat['id']} (YELLOW): category {category} has matches but count is 0"
                     )
-                
-                # Verify pattern match counts: if category is detected, instances > 0
-                for category, matches in result.matches.items():
-                    if matches:
-                        assert len(matches) > 0, (
-                            f"Chat {chat['id']} (YELLOW): category {category} has matches but count is 0"
-                        )
         
-        # Note: Generator creates synthetic examples that may not always match patterns exactly
-        # Tests verify correct behavior when classifications occur, not perfect classification rate
-        # If no YELLOW classifications occur, that's acceptable - generator may need refinement
-        if yellow_count > 0:
-            # If we have YELLOW classifications, verify they behave correctly (already done above)
-            pass
-        # If yellow_count == 0, that's acceptable - generator creates synthetic examples
-
-    def test_red_chats(self, detection_engine, generator):
+        # The generator creates synthetic examples that may not always match patterns
+        # exactly, so there is no minimum YELLOW rate
+
+    @pytest.mark.parametrize("chat", RED_CHATS, ids=lambda chat: chat["id"])
+    def test_red_chats(self, red_results, chat):
         """Test RED chats: should be classified as red with 'Need Immediate Help?'."""
-        red_chats = [generator.generate_red_chat(f"red_{i}") for i in range(30)]
+        result = red_results[chat["chat_text"]]
         
-        red_count = 0
-        for chat in red_chats:
-            result = detection_engine.analyze(chat["chat_text"])
-            
-            # Most should be RED (allow some YELLOW due to pattern matching)
-            if result.risk_level == RiskLevel.RED:
-                red_count += 1
+        # Not every chat is RED (some YELLOW due to pattern matching);
+        # behavior is verified for the ones that are
+        if result.risk_level == RiskLevel.RED:
+            # For chats actually classified as RED, verify correct behavior
+            # Verify pattern match counts: if category is detected, instances > 0
+            for category, matches in result.matches.items():
+                if matches:
+                    assert len(matches) > 0, (
+                        f"Chat {chat['id']} (RED): category {category} has matches but count is 0"
+                    )
             
-                # For chats actually classified as RED, verify correct behavior
-                explanation_lower = result.explanation.lower()
-                
-                # Verify pattern match counts: if category is detected, instances > 0
-                for category, matches in result.matches.items():
-                    if matches:
-                        assert len(matches) > 0, (
-                            f"Chat {chat['id']} (RED): category {category} has matches but count is 0"
-                        )
-                
-                # Verify evidence-based explanations: if secrecy/isolation/control is present,
-                # check that explanations reference them only if patterns matched
-                if chat["contains"]["secrecy"]:
-                    # Secrecy should be mentioned if patterns matched
-                    has_secrecy_patterns = any(
-                        "secrecy" in cat.lower() or "secret" in cat.lower()
-                        for cat in result.matches.keys()
+            # Verify evidence-based explanations: if secrecy/isolation/control is present,
+            # check that explanations reference them only if patterns matched
+            categories_lower = [cat.lower() for cat in result.matches]
+            if chat["contains"]["secrecy"]:
+                # Secrecy should be mentioned if patterns matched
+                has_secrecy_patterns = any(
+                    "secrecy" in cat or "secret" in cat for cat in categories_lower
+                )
+                if has_secrecy_patterns:
+                    # Check for any form of secrecy-related words in explanation
+                    # (secret, secrets, secrecy, private)
+                    assert SECRECY_RE.search(result.explanation), (
+                        f"Chat {chat['id']} (RED) has secrecy patterns but not mentioned in explanation. Explanation: {result.explanation[:200]}"
                     )
-                    if has_secrecy_patterns:
-                        # Check for any form of secrecy-related words in explanation
-                        # (secret, secrets, secrecy, private)
-                        assert "secret" in explanation_lower or "private" in explanation_lower or "secrecy" in explanation_lower or "secrets" in explanation_lower, (
-                            f"Chat {chat['id']} (RED) has secrecy patterns but not mentioned in explanation. Explanation: {result.explanation[:200]}"
-                        )
-                
-                if chat["contains"]["coercive_control"]:
-                    # Coercive control should be mentioned if patterns matched
-                    has_control_patterns = any(
-                        "pressure" in cat.lower() or "coercive" in cat.lower() or "manipulation" in cat.lower()
-                        for cat in result.matches.keys()
+            
+            if chat["contains"]["coercive_control"]:
+                # Coercive control should be mentioned if patterns matched
+                has_control_patterns = any(
+                    "pressure" in cat or "coercive" in cat or "manipulation" in cat
+                    for cat in categories_lower
+                )
+                if has_control_patterns:
+                    assert CONTROL_RE.search(result.explanation), (
+                        f"Chat {chat['id']} (RED) has control patterns but not mentioned in explanation"
                     )
-                    if has_control_patterns:
-                        assert "control" in explanation_lower or "pressure" in explanation_lower, (
-                            f"Chat {chat['id']} (RED) has control patterns but not mentioned in explanation"
-                        )
         
-        # Note: Generator creates synthetic examples that may not always match patterns exactly
-        # Tests verify correct behavior when classifications occur, not perfect classification rate
-        # If no RED classifications occur, that's acceptable - generator may need refinement
-        if red_count > 0:
-            # If we have RED classifications, verify they behave correctly (already done above)
-            pass
-        # If red_count == 0, that's acceptable - generator creates synthetic examples
-
-    def test_right_now_context_gating(self, detection_engine, generator):
+        # The generator creates synthetic examples that may not always match patterns
+        # exactly, so there is no minimum RED rate
+
+    def test_right_now_context_gating(self, analyze):
         """Test 'right now' context gating: self-reports vs demands."""
         # Self-report: should be GREEN/low
         self_report = "Friend: Hey\nYou: I'm busy rn\nFriend: Okay, np"
-        result_self = detection_engine.analyze(self_report)
+        result_self = analyze(self_report)
         # Should be GREEN or very low YELLOW
         assert result_self.risk_level in [RiskLevel.GREEN, RiskLevel.YELLOW], (
             f"Self-report 'I'm busy rn' should be GREEN/YELLOW, got {result_self.risk_level}"
@@ -182,7 +182,7 @@ class TestGeneratedChatCorpus:
         
         # Demand: should trigger pressure (YELLOW/RED)
         demand = "Friend: Answer rn\nFriend: Do it rn\nFriend: Right now. Answer."
-        result_demand = detection_engine.analyze(demand)
+        result_demand = analyze(demand)
         # Should be YELLOW or RED
         assert result_demand.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
             f"Demand 'Answer rn' should be YELLOW/RED, got {result_demand.risk_level}"
@@ -191,18 +191,16 @@ class TestGeneratedChatCorpus:
         # Verify pattern matches for demand
         if result_demand.risk_level == RiskLevel.YELLOW:
             # Should have pressure patterns
-            has_pressure = "pressure" in result_demand.matches or any(
-                "pressure" in cat.lower() for cat in result_demand.matches.keys()
-            )
+            has_pressure = any("pressure" in cat.lower() for cat in result_demand.matches)
             assert has_pressure or len(result_demand.matches) > 0, (
                 "Demand should have pattern matches"
             )
 
-    def test_obfuscation_variants(self, detection_engine, generator):
+    def test_obfuscation_variants(self, analyze):
         """Test that obfuscation variants are handled correctly."""
         # Test spacing variants
         spacing_chat = "Friend: Answer r n\nFriend: Do it r.n."
-        result = detection_engine.analyze(spacing_chat)
+        result = analyze(spacing_chat)
         # Should detect pressure despite obfuscation
         assert result.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
             f"Obfuscated 'r n' should trigger detection, got {result.risk_level}"
@@ -210,9 +208,21 @@ class TestGeneratedChatCorpus:
         
         # Test repeated letters
         repeat_chat = "Friend: Do it nowww\nFriend: Comeee on"
-        result = detection_engine.analyze(repeat_chat)
+        result = analyze(repeat_chat)
         # Should detect pressure
         assert result.risk_level in [RiskLevel.YELLOW, RiskLevel.RED], (
             f"Repeated letters should trigger detection, got {result.risk_level}"
         )
 
+    def test_corpus_levels_generated_independently(self, generator):
+        """Test that the corpus equals its independently generated levels, in order."""
+        corpus = generator.generate_corpus(count_per_level=5)
+        levels = [chat for level in RISK_LEVELS for chat in generate_level(level, 5, seed=1337)]
+        
+        assert corpus == levels, "Corpus should match per-level generation with the same seed"
+        assert corpus == ChatCorpusGenerator(seed=1337).generate_corpus(count_per_level=5), (
+            "Corpus generation should be deterministic for a fixed seed"
+        )
+        assert [chat["id"] for chat in corpus[:2]] == ["green_001", "green_002"], (
+            f"Corpus should start with GREEN chats, got {[chat['id'] for chat in corpus[:2]]}"
+        )
@@ -1,7 +1,8 @@
 """Tests for model inference."""
 
+import numpy as np
 import pytest
-from app.models_local.embeddings import EmbeddingModel
+from app.models_local.embeddings import ONNX_AVAILABLE, EmbeddingModel, OnnxSentenceEncoder
 from app.models_local.classifier import RiskClassifier
 
 
@@ -30,3 +31,39 @@ def test_classifier_without_ml():
     result = classifier.classify("Test text")
     assert isinstance(result, dict)
 
+
+
+class _StubTokenizer:
+    """Tokenizer with one token per word, padded to three tokens."""
+
+    def __call__(self, texts, **kwargs):
+        attention_mask = np.array([[1] * len(text.split()) + [0] * (3 - len(text.split())) for text in texts])
+        return {"input_ids": attention_mask * 7, "attention_mask": attention_mask}
+
+
+class _StubSession:
+    """ONNX session returning token embeddings [[1, 0], [3, 0], [100, 100]] per text."""
+
+    def run(self, output_names, feeds):
+        assert all(array.dtype == np.int64 for array in feeds.values())
+        batch = feeds["input_ids"].shape[0]
+        token_embeddings = np.array([[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]]] * batch)
+        return [token_embeddings.astype(np.float32)]
+
+
+@pytest.mark.skipif(not ONNX_AVAILABLE, reason="onnxruntime/transformers not installed")
+def test_onnx_encoder_mean_pools_and_normalizes():
+    """Test that the ONNX encoder mean-pools non-padding tokens and L2-normalizes."""
+    encoder = OnnxSentenceEncoder.__new__(OnnxSentenceEncoder)
+    encoder.tokenizer = _StubTokenizer()
+    encoder.session = _StubSession()
+    encoder.input_names = {"input_ids", "attention_mask"}
+    encoder.max_seq_length = 256
+    
+    embeddings = encoder.encode(["padded to three", "two tokens"], batch_size=1)
+    
+    assert embeddings.shape == (2, 2)
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-6)
+    # Second text's padding token ([100, 100]) must not leak into the mean
+    np.testing.assert_allclose(embeddings[1], [1.0, 0.0], rtol=1e-6)
+    assert encoder.encode([]).shape[0] == 0
@@ -0,0 +1,70 @@
+"""Tests for text processing utilities."""
+
+from app.utils.text_processing import (
+    extract_message_pairs,
+    extract_message_pairs_iter,
+    get_sentence_context,
+    segment_sentences,
+    segment_sentences_iter,
+)
+
+
+def test_segment_sentences_iter_matches_list():
+    """Test that the lazy segmenter yields the same sentences as the list version."""
+    text = "Answer me. Right now!! Why?  ...  ok"
+
+    assert list(segment_sentences_iter(text)) == segment_sentences(text)
+    assert segment_sentences(text) == ["Answer me", "Right now", "Why", "ok"]
+
+
+def test_segment_sentences_empty_text():
+    """Test that empty or punctuation-only text yields no sentences."""
+    assert segment_sentences("") == []
+    assert segment_sentences("...!?") == []
+
+
+def test_extract_message_pairs_structured():
+    """Test that speaker-labelled chats are split into (speaker, message) pairs."""
+    text = "Alex: hey\nSam: what's up?\nAlex: not much"
+
+    pairs = extract_message_pairs(text)
+
+    assert pairs == [("Alex", "hey"), ("Sam", "what's up?"), ("Alex", "not much")]
+    assert list(extract_message_pairs_iter(text)) == pairs
+
+
+def test_extract_message_pairs_unstructured():
+    """Test that text without speaker labels is returned as a single message."""
+    text = "just a plain message"
+
+    assert extract_message_pairs(text) == [(None, text)]
+    assert list(extract_message_pairs_iter(text)) == [(None, text)]
+
+
+def test_extract_message_pairs_interns_speakers():
+    """Test that repeated speaker labels share a single string object."""
+    text = "Alex: one\nSam: two\nAlex: three"
+
+    pairs = extract_message_pairs(text)
+
+    assert pairs[0][0] is pairs[2][0]
+
+
+def test_get_sentence_context_window():
+    """Test that the context covers the matched sentence and its neighbours."""
+    text = "One. Two. Three. Four."
+    # Positions are offsets in the space-joined sentences: "One Two Three Four"
+    position = "One Two Three Four".index("Three")
+
+    assert get_sentence_context(text, position, window=0) == "Three"
+    assert get_sentence_context(text, position, window=1) == "Two Three Four"
+    assert get_sentence_context(text, 0, window=1) == "One Two"
+
+
+def test_get_sentence_context_out_of_range():
+    """Test that positions outside any sentence return an empty context."""
+    text = "One. Two."
+
+    assert get_sentence_context(text, 3) == ""  # delimiter between sentences
+    assert get_sentence_context(text, 100) == ""
+    assert get_sentence_context("", 0) == ""
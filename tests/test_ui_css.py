@@ -1,37 +1,23 @@
 """Tests for UI CSS rules and styling."""
 
-from app.ui.theme import inject_theme_css
+from app.ui.theme import THEME_CSS
 
 
 def test_anchor_icons_css_present():
     """Test that CSS rules to hide anchor icons are present in theme CSS."""
-    # Get the CSS by calling inject_theme_css and capturing the output
-    # Since inject_theme_css uses st.markdown, we need to inspect the function source
-    import inspect
+    # The stylesheet is a module-level constant, so inspect it directly
+    source = THEME_CSS
     
-    source = inspect.getsource(inject_theme_css)
-    
-    # Verify CSS contains selectors to hide anchor icons (including fallback selectors)
-    assert 'a[aria-label="Link to this section"]' in source, "CSS should hide anchor icons with aria-label"
-    assert 'a.header-anchor' in source, "CSS should hide .header-anchor elements"
-    assert 'a.anchor-link' in source, "CSS should hide .anchor-link elements"
-    assert 'a[class*="anchor"]' in source, "CSS should hide anchor elements with class containing 'anchor' (fallback)"
-    assert 'a[class*="header"]' in source, "CSS should hide anchor elements with class containing 'header' (fallback)"
-    assert '.stMarkdown a[href^="#"][aria-label]' in source, "CSS should hide anchor links in markdown"
-    assert '.stMarkdown h1 > a' in source or '.stMarkdown h2 > a' in source or '.stMarkdown h3 > a' in source, "CSS should hide anchor links in markdown headings"
-    assert 'h1 a, h2 a, h3 a' in source or 'h1 a' in source, "CSS should hide anchor links in headings"
+    # Verify CSS contains the selectors that hide heading anchor icons
+    assert ':is(h1, h2, h3, h4, h5, h6) :is(a[href^="#"], a[class*="anchor" i])' in source, (
+        "CSS should hide in-page and anchor-classed links in headings"
+    )
     assert 'display: none !important' in source, "CSS should use display: none to hide anchors"
-    
-    # Verify external links are preserved
-    assert 'http://' in source or 'https://' in source, "CSS should preserve external links"
-    assert 'display: inline !important' in source, "CSS should preserve external links with display: inline"
 
 
 def test_primary_button_styling_present():
     """Test that primary button styling uses brand CSS variables."""
-    import inspect
-    
-    source = inspect.getsource(inject_theme_css)
+    source = THEME_CSS
     
     # Verify primary button styling exists and uses CSS variables
     assert 'button[kind="primary"]' in source or 'button[type="primary"]' in source, "CSS should style primary buttons"
@@ -58,9 +44,7 @@ def test_primary_button_styling_present():
 
 def test_spacing_css_present():
     """Test that compact spacing CSS rules are present."""
-    import inspect
-    
-    source = inspect.getsource(inject_theme_css)
+    source = THEME_CSS
     
     # Verify spacing rules for status dots
     assert '.status-dot-container' in source, "CSS should style status-dot-container"
@@ -70,21 +54,18 @@ def test_spacing_css_present():
 
 def test_next_steps_panel_styling_present():
     """Test that Next Steps panel styling is present."""
-    import inspect
-    
-    source = inspect.getsource(inject_theme_css)
+    source = THEME_CSS
     
     # Verify panel styling exists
-    assert '.element-container' in source or 'element-container' in source, "CSS should style element containers"
+    assert '.st-key-next_steps_panel' in source, "CSS should style the keyed Next Steps container"
+    assert ':has(' not in source, "CSS should not use relational :has() selectors"
     assert '#f8f9fa' in source, "CSS should use light background for panels"
     assert 'border-radius: 12px' in source or 'border-radius:12px' in source, "CSS should have rounded corners for panels"
 
 
 def test_brand_variables_defined():
     """Test that brand CSS variables are defined in :root."""
-    import inspect
-    
-    source = inspect.getsource(inject_theme_css)
+    source = THEME_CSS
     
     # Verify :root block exists with brand variables
     assert ':root' in source, "CSS should define :root for CSS variables"
@@ -100,9 +81,7 @@ def test_brand_variables_defined():
 
 def test_focus_visible_states_present():
     """Test that :focus-visible CSS rules are present for accessibility."""
-    import inspect
-    
-    source = inspect.getsource(inject_theme_css)
+    source = THEME_CSS
     
     # Verify focus-visible rules exist
     assert ':focus-visible' in source, "CSS should include :focus-visible rules for accessibility"
@@ -115,24 +94,18 @@ def test_focus_visible_states_present():
 
 
 def test_anchor_icon_hiding_robust():
-    """Test that anchor icon hiding is robust with multiple selectors and doesn't break content links."""
-    import inspect
-    
-    source = inspect.getsource(inject_theme_css)
-    
-    # Verify multiple anchor hiding selectors exist (robustness)
-    assert 'a[aria-label="Link to this section"]' in source, "CSS should hide anchor icons with aria-label"
-    assert 'a.header-anchor' in source, "CSS should hide .header-anchor elements"
-    assert 'a.anchor-link' in source, "CSS should hide .anchor-link elements"
-    assert 'a[class*="anchor"]' in source, "CSS should hide anchor elements with class containing 'anchor' (fallback)"
-    assert 'a[class*="header"]' in source, "CSS should hide anchor elements with class containing 'header' (fallback)"
-    assert '.stMarkdown h1 > a' in source or '.stMarkdown h2 > a' in source, "CSS should hide anchor links in markdown headings"
-    
-    # Verify content links are NOT hidden (preserved)
-    assert '.stMarkdown a[href^="http://"]' in source or '.stMarkdown a[href^="https://"]' in source, "CSS should preserve external links"
-    assert 'display: inline !important' in source, "CSS should explicitly preserve external links with display: inline"
-    assert '.stMarkdown a:not([href^="#"])' in source, "CSS should preserve content links (not starting with #)"
+    """Test that anchor icon hiding only targets anchors and doesn't break content links."""
+    source = THEME_CSS
+    
+    # Verify heading links are only hidden when they point inside the page
+    assert 'h6) :is(a[href^="#"], a[class*="anchor" i])' in source, (
+        "CSS should only hide heading links with in-page hrefs or anchor classes"
+    )
+    assert source.count('a[class*="anchor"') == 1, (
+        "CSS should not hide anchor-classed content links outside headings"
+    )
+    assert 'h1 a, h2 a' not in source, "CSS should not hide every link inside headings"
+    assert 'a[class*="header"]' not in source, "CSS should not hide links by 'header' class substring"
     
     # Verify comment explaining intent exists
     assert 'Intent:' in source or 'intent:' in source or 'Hide anchor icons' in source, "CSS should include comment explaining anchor hiding intent"
-